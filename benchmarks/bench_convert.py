@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-row and columnar Cursor API response converters.
+
+Usage:
+    python benchmarks/bench_convert.py --rows 1000000
+"""
+import argparse
+import time
+
+from harness import convert_rows_frame  # also adds src to the path
+
+import pandas as pd
+
+from cursor_dashboard.api.integration import CursorAPIFetcher
+from cursor_dashboard.api.synthetic import generate_usage_payload
+from cursor_dashboard.utils.dates import to_epoch_ms
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--developers', type=int, default=2000)
+    args = parser.parse_args()
+
+    days = -(-args.rows // args.developers)
+    payload = generate_usage_payload(args.developers, days)
+    payload['data'] = payload['data'][:args.rows]
+    fetcher = CursorAPIFetcher(base_url='http://localhost', api_key='benchmark')
+
+    row_seconds, row_df = timed(convert_rows_frame, payload)
+    frame_seconds, frame_df = timed(fetcher._convert_cursor_data_to_dashboard_frame, payload)
+
+    # The old path kept localized datetimes and no team; compare it in the new layout
+    row_df['date'] = to_epoch_ms(row_df['date'])
+    row_df.insert(0, 'team', fetcher.team)
+    pd.testing.assert_frame_equal(row_df, frame_df, check_dtype=False)
+    print(f"rows:      {args.rows:,}")
+    print(f"per-row:   {row_seconds:8.2f}s")
+    print(f"columnar:  {frame_seconds:8.2f}s")
+    print(f"speedup:   {row_seconds / frame_seconds:8.1f}x")
+
+if __name__ == "__main__":
+    main()
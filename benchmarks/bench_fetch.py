@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Measure CursorAPIFetcher throughput and latency against the local mock Cursor Admin API.
+
+Each scenario starts `python -m cursor_dashboard.api.mock_server` in a
+subprocess with different latency, rate-limit and fault-injection settings,
+then backfills the whole range into a DataFrame through the streaming path
+the ingester uses.
+
+Usage:
+    python benchmarks/bench_fetch.py --developers 500 --days 365
+    python benchmarks/bench_fetch.py --scenarios baseline,faulty --workers 8
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import harness  # noqa: F401  (adds src to the path)
+
+import numpy as np
+
+from cursor_dashboard.api.integration import CursorAPIFetcher
+
+SCENARIOS = {
+    'baseline': [],
+    'latency': ['--latency-ms', '100', '--jitter-ms', '100'],
+    'rate_limited': ['--rate-limit', '4', '--retry-after', '1'],
+    'faulty': ['--error-rate', '0.1', '--timeout-rate', '0.03', '--timeout-seconds', '5'],
+}
+
+class TimedFetcher(CursorAPIFetcher):
+    """Fetcher that records per-window latency (request, streaming and conversion) and every HTTP response status"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.window_latencies = []
+        self.statuses = []
+        self._lock = threading.Lock()
+        self.session.hooks['response'].append(self._record_response)
+
+    def _record_response(self, response, *args, **kwargs):
+        with self._lock:
+            self.statuses.append(response.status_code)
+
+    def _load_window_frame(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super()._load_window_frame(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.window_latencies.append(time.perf_counter() - start)
+
+def start_server(args, scenario_flags):
+    """Start the mock server subprocess and return (process, base_url)"""
+    src_path = str(Path(__file__).resolve().parent.parent / "src")
+    env = dict(os.environ, PYTHONPATH=src_path + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    command = [sys.executable, '-m', 'cursor_dashboard.api.mock_server', '--port', '0',
+               '--api-key', 'bench-key', '--developers', str(args.developers), '--days', str(args.days)]
+    process = subprocess.Popen(command + scenario_flags, env=env, stdout=subprocess.PIPE, text=True)
+    # The server prints its URL once the synthetic data is serialized
+    banner = process.stdout.readline()
+    return process, next(token for token in banner.split() if token.startswith('http'))
+
+def run_scenario(name, args):
+    process, base_url = start_server(args, SCENARIOS[name])
+    try:
+        fetcher = TimedFetcher(base_url=base_url, api_key='bench-key')
+        fetcher.timeout = args.client_timeout
+        fetcher.backoff_factor = args.backoff
+        end = datetime.now(timezone.utc)
+        start_ms = int((end - timedelta(days=args.days - 1)).timestamp() * 1000)
+        end_ms = int(end.timestamp() * 1000)
+
+        started = time.perf_counter()
+        df = fetcher.backfill_usage_frame(start_ms, end_ms, window_days=args.window_days,
+                                          max_workers=args.workers, checkpoint_dir='')
+        finished = time.perf_counter()
+    finally:
+        process.terminate()
+        process.wait()
+
+    latencies = np.array(fetcher.window_latencies) * 1000
+    statuses = fetcher.statuses
+    print(f"\n{name}")
+    print(f"  rows:            {len(df):,}")
+    print(f"  HTTP requests:   {len(statuses)} ({statuses.count(429)} x 429, "
+          f"{sum(1 for s in statuses if s >= 500)} x 5xx)")
+    print(f"  requests/sec:    {len(statuses) / (finished - started):.1f}")
+    print(f"  window p50/p99:  {np.percentile(latencies, 50):.0f} / {np.percentile(latencies, 99):.0f} ms")
+    print(f"  to DataFrame:    {finished - started:.2f}s end to end")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='Comma-separated scenario names')
+    parser.add_argument('--developers', type=int, default=200)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--window-days', type=int, default=7)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--client-timeout', type=float, default=2.0)
+    parser.add_argument('--backoff', type=float, default=0.1, help='Fetcher backoff factor in seconds')
+    args = parser.parse_args()
+
+    for name in args.scenarios.split(','):
+        run_scenario(name, args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Time and memory-profile each stage of the dashboard data pipeline.
+
+Usage:
+    python benchmarks/bench_pipeline.py --sizes 100x30,1000x90,2000x365
+    python benchmarks/bench_pipeline.py --json results.json
+    python benchmarks/bench_pipeline.py --compare results.json --tolerance 0.25
+"""
+import argparse
+import json
+import sys
+
+from harness import convert_rows_frame, measure, parse_sizes
+
+from cursor_dashboard.api.integration import CursorAPIFetcher
+from cursor_dashboard.api.synthetic import generate_usage_payload
+from cursor_dashboard.components.charts import create_lines_accepted_chart
+from cursor_dashboard.utils.developer_index import DeveloperIndex
+from cursor_dashboard.utils.developer_profile import prepare_developer_profile
+from cursor_dashboard.utils.data_processing import calculate_kpis, prepare_chart_data, sort_by_date
+from cursor_dashboard.utils.rollups import UsageRollup
+from cursor_dashboard.utils.schema import compact_usage_frame
+
+def run_pipeline(developers, days, seed):
+    """Run every stage once on a generated payload, returning {stage: (seconds, peak_bytes)}"""
+    payload = generate_usage_payload(developers, days, seed=seed)
+    fetcher = CursorAPIFetcher(base_url='http://localhost', api_key='benchmark')
+    results = {}
+
+    def stage(name, func, *args):
+        seconds, peak, result = measure(func, *args)
+        results[name] = (seconds, peak)
+        return result
+
+    stage('convert_rows', convert_rows_frame, payload)
+    df = stage('convert_frame', fetcher._convert_cursor_data_to_dashboard_frame, payload)
+    del payload
+    df = stage('compact', compact_usage_frame, df)
+    df = stage('sort', sort_by_date, df)
+    # The raw frame path scans every daily row; the rollup stages below answer the same full range
+    stage('kpis_raw', calculate_kpis, df)
+    stage('chart_data_raw', prepare_chart_data, df)
+    rollup = stage('rollup_build', UsageRollup, df)
+    stage('kpis_rollup_1Y', calculate_kpis, rollup, (rollup.min_day, rollup.max_day))
+    chart_data = stage('chart_data_rollup_1Y', prepare_chart_data, rollup, (rollup.min_day, rollup.max_day))
+    stage('chart_render', create_lines_accepted_chart, chart_data)
+    # The rollup builds this index once; a drill-down is then one developer's slice
+    stage('developer_index', DeveloperIndex, rollup.levels['day'])
+    stage('developer_profile_1Y', prepare_developer_profile, rollup, chart_data['Developer'].iloc[0],
+          (rollup.min_day, rollup.max_day))
+    return results
+
+def print_table(size, results):
+    print(f"\n{size}")
+    print(f"  {'stage':<22}{'seconds':>10}{'peak MB':>10}")
+    for name, (seconds, peak) in results.items():
+        print(f"  {name:<22}{seconds:>10.3f}{peak / 1e6:>10.1f}")
+
+def compare(results, baseline, tolerance):
+    """Report stages slower than baseline by more than tolerance; returns True if any regressed"""
+    regressed = False
+    for size, stages in results.items():
+        for name, (seconds, _) in stages.items():
+            previous = baseline.get(size, {}).get(name)
+            if previous and seconds > previous[0] * (1 + tolerance) and seconds - previous[0] > 0.01:
+                print(f"REGRESSION {size} {name}: {previous[0]:.3f}s -> {seconds:.3f}s")
+                regressed = True
+    return regressed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=parse_sizes, default=parse_sizes('100x30,1000x90,2000x365'),
+                        help='Comma-separated DEVELOPERSxDAYS sizes')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Baseline JSON file from a previous --json run')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown vs baseline (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    all_results = {}
+    for developers, days in args.sizes:
+        size = f"{developers}x{days}"
+        all_results[size] = run_pipeline(developers, days, args.seed)
+        print_table(f"{size} ({developers * days:,} rows)", all_results[size])
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(all_results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(all_results, baseline, args.tolerance):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
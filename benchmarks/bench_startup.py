@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Measure dashboard cold start: module import time and time to first render.
+
+Every measurement runs in a fresh Python process. import_app imports
+cursor_dashboard.app with Streamlit and pandas already loaded, as in a
+running `streamlit run` server; import_cold includes them. first_render is
+that import plus the first script run of a new session in mock mode, and
+rerun the next script run, both driven by Streamlit's AppTest.
+
+Usage:
+    python benchmarks/bench_startup.py --repeats 5
+    python benchmarks/bench_startup.py --json startup.json
+    python benchmarks/bench_startup.py --compare startup.json --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules the dashboard should only load once a section needs them (Streamlit itself loads pyarrow)
+HEAVY_MODULES = ['plotly.express', 'requests', 'pymongo', 'cursor_dashboard.api.integration',
+                 'cursor_dashboard.export.core']
+
+IMPORT_CODE = """
+import json, sys, time
+{preload}
+started = time.perf_counter()
+import cursor_dashboard.app
+seconds = time.perf_counter() - started
+print(json.dumps({{'seconds': seconds, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+RENDER_CODE = """
+import json, time
+import pandas, streamlit
+from streamlit.testing.v1 import AppTest
+started = time.perf_counter()
+import cursor_dashboard.app as app
+imported = time.perf_counter() - started
+runs = []
+main = app.main
+def timed_main():
+    started = time.perf_counter()
+    try:
+        main()
+    finally:
+        runs.append(time.perf_counter() - started)
+# run.py looks main up on every run, so the script runs are timed exactly rather than at AppTest's polling interval
+app.main = timed_main
+at = AppTest.from_file({run_py!r}, default_timeout=600)
+at.run()
+at.run()
+print(json.dumps({{'first_render': imported + runs[0], 'rerun': runs[1], 'exceptions': [e.message for e in at.exception]}}))
+"""
+
+def run_child(code, developers):
+    """Run code in a fresh interpreter in mock mode and return the JSON it prints last"""
+    env = dict(os.environ, PYTHONPATH=str(ROOT / 'src'), ENABLE_MOCK_DATA='true', API_KEY='', API_TEAMS='',
+               MOCK_DEVELOPERS=str(developers))
+    completed = subprocess.run([sys.executable, '-c', code], env=env, cwd=ROOT, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'child failed')
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def run_startup(repeats, developers):
+    """Measure every startup stage repeats times, returning ({stage: median seconds}, heavy modules loaded on import)"""
+    samples = {'import_cold': [], 'import_app': [], 'first_render': [], 'rerun': []}
+    loaded = []
+    for _ in range(repeats):
+        samples['import_cold'].append(run_child(IMPORT_CODE.format(preload='', heavy=HEAVY_MODULES), developers)['seconds'])
+        result = run_child(IMPORT_CODE.format(preload='import pandas, streamlit', heavy=HEAVY_MODULES), developers)
+        samples['import_app'].append(result['seconds'])
+        loaded = result['loaded']
+        render = run_child(RENDER_CODE.format(run_py=str(ROOT / 'run.py')), developers)
+        if render['exceptions']:
+            raise RuntimeError(f"Dashboard raised: {render['exceptions'][0]}")
+        samples['first_render'].append(render['first_render'])
+        samples['rerun'].append(render['rerun'])
+    return {stage: statistics.median(values) for stage, values in samples.items()}, loaded
+
+def compare(results, baseline, tolerance):
+    """Report stages slower than baseline by more than tolerance; returns True if any regressed"""
+    regressed = False
+    for name, seconds in results.items():
+        previous = baseline.get(name)
+        if previous and seconds > previous * (1 + tolerance) and seconds - previous > 0.01:
+            print(f"REGRESSION {name}: {previous:.3f}s -> {seconds:.3f}s")
+            regressed = True
+    return regressed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=3, help='Fresh processes per stage; the median is reported')
+    parser.add_argument('--developers', type=int, default=50, help='Mock developers rendered')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Baseline JSON file from a previous --json run')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown vs baseline (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    results, loaded = run_startup(args.repeats, args.developers)
+    print(f"\nStartup (median of {args.repeats}, {args.developers} mock developers)")
+    print(f"  {'stage':<22}{'seconds':>10}")
+    for name, seconds in results.items():
+        print(f"  {name:<22}{seconds:>10.3f}")
+    print(f"  heavy modules loaded on import: {', '.join(loaded) or 'none'}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+def measure(func, *args, **kwargs):
+    """Run func once, returning (seconds, peak_traced_bytes, result)"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, peak, result
+
+def convert_rows(cursor_data):
+    """Per-row reference converter, as the dashboard ran before the columnar converter replaced it.
+
+    Kept verbatim, including the per-row timezone conversion and isoformat,
+    so the columnar CursorAPIFetcher._convert_cursor_data_to_dashboard_frame
+    is benchmarked against the real cost of the old path.
+    """
+    from datetime import datetime
+    from cursor_dashboard.config.settings import get_current_datetime, get_timezone
+    dashboard_data = []
+    tz = get_timezone()
+    if 'data' in cursor_data:
+        for day_data in cursor_data['data']:
+            # Convert timestamp from milliseconds to datetime
+            date_timestamp = day_data.get('date')
+            if date_timestamp:
+                # Convert from milliseconds to datetime in configured timezone
+                date_obj = datetime.fromtimestamp(date_timestamp / 1000, tz=tz)
+                date_str = date_obj.isoformat()
+            else:
+                date_str = get_current_datetime().isoformat()
+            
+            row = {
+                'user': day_data.get('email', 'Unknown').split('@')[0].replace('.', ' ').title(),
+                'email': day_data.get('email', ''),
+                'date': date_str,
+                'totalLinesAdded': day_data.get('totalLinesAdded', 0),
+                'totalLinesDeleted': day_data.get('totalLinesDeleted', 0),
+                'acceptedLinesAdded': day_data.get('acceptedLinesAdded', 0),
+                'acceptedLinesDeleted': day_data.get('acceptedLinesDeleted', 0),
+                'totalApplies': day_data.get('totalApplies', 0),
+                'totalAccepts': day_data.get('totalAccepts', 0),
+                'totalRejects': day_data.get('totalRejects', 0),
+                'totalTabsShown': day_data.get('totalTabsShown', 0),
+                'totalTabsAccepted': day_data.get('totalTabsAccepted', 0),
+                'composerRequests': day_data.get('composerRequests', 0),
+                'chatRequests': day_data.get('chatRequests', 0),
+                'agentRequests': day_data.get('agentRequests', 0),
+                'cmdkUsages': day_data.get('cmdkUsages', 0),
+                'subscriptionIncludedReqs': day_data.get('subscriptionIncludedReqs', 0),
+                'apiKeyReqs': day_data.get('apiKeyReqs', 0),
+                'usageBasedReqs': day_data.get('usageBasedReqs', 0),
+                'bugbotUsages': day_data.get('bugbotUsages', 0),
+            }
+            dashboard_data.append(row)
+    
+    return dashboard_data
+
+def convert_rows_frame(cursor_data):
+    """The old load path end to end: per-row conversion, then a DataFrame with the ISO dates parsed back"""
+    import pandas as pd
+    df = pd.DataFrame(convert_rows(cursor_data))
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+def parse_sizes(value):
+    """Parse '100x30,1000x90' into [(100, 30), (1000, 90)] (developers x days)"""
+    sizes = []
+    for item in value.split(','):
+        developers, days = item.lower().split('x')
+        sizes.append((int(developers), int(days)))
+    return sizes
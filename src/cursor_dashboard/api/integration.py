@@ -1,142 +1,318 @@
+import logging
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
 import requests
+from requests.adapters import HTTPAdapter
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-from typing import Dict, List
-import streamlit as st
-from ..config.settings import get_api_config, get_timezone, get_current_datetime
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from ..config.settings import (
+    get_api_config, get_current_datetime, get_dev_config, get_team_key
+)
+from ..utils.data_processing import USAGE_COUNTER_COLUMNS
+from ..utils.dates import DAY_MS
+from ..utils.schema import compact_usage_frame
+from ..utils.metrics import increment, span
+from ..utils.rate_limit import RateLimiter
+from ..utils.single_flight import SingleFlight
+from .streaming import iter_record_batches
+from .synthetic import generate_usage_payload
+
+logger = logging.getLogger(__name__)
+
+
+# Bytes read from the socket at a time when streaming responses
+STREAM_CHUNK_BYTES = 64 * 1024
+
+# Status codes that are worth retrying (rate limiting and transient server errors)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 
 class CursorAPIFetcher:
     """Class to handle Cursor API data fetching for dashboard KPIs and chart"""
     
-    def __init__(self, base_url: str = None, api_key: str = None):
+    def __init__(self, base_url: str = None, api_key: str = None, team: str = None, rate_limit: float = None):
         api_config = get_api_config()
         self.base_url = base_url or api_config['base_url']
         self.api_key = api_key or api_config['api_key']
+        # Stored with every row this fetcher converts
+        self.team = team or api_config['team_name']
+        self.timeout = api_config['timeout']
+        self.window_days = api_config['backfill_window_days']
+        self.max_workers = api_config['max_workers']
+        self.max_retries = api_config['max_retries']
+        self.backoff_factor = api_config['backoff_factor']
+        self.max_retry_after = api_config['max_retry_after']
+        self.checkpoint_dir = api_config['checkpoint_dir']
+        self.stream_batch_size = api_config['stream_batch_size']
+        # Identical windows requested concurrently (e.g. by several viewers) share one request
+        self.flight = SingleFlight()
+        # Shared by every window and retry of this team's fetches
+        self.rate_limiter = RateLimiter(api_config['rate_limit'] if rate_limit is None else rate_limit)
         self.session = requests.Session()
         
+        # Size the connection pool so every backfill worker reuses a pooled connection
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(self.max_workers, 1))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         # Use Basic Auth with API key as username and empty password
         if self.api_key:
             self.session.auth = (self.api_key, '')
         self.session.headers.update(api_config['headers'])
 
-    def fetch_usage_data(self, start_date: str = None, end_date: str = None) -> List[Dict]:
-        """Fetch usage data from Cursor Admin API for dashboard KPIs and chart"""
-        try:
-            # Use configured timezone from settings
-            tz = get_timezone()
-            # Convert dates to epoch milliseconds for Cursor API
-            if not start_date:
-                start_date = int((get_current_datetime() - timedelta(days=30)).timestamp() * 1000)
-            else:
-                start_date = int(datetime.fromisoformat(start_date.replace('Z', '+00:00')).timestamp() * 1000)
-            if not end_date:
-                end_date = int(get_current_datetime().timestamp() * 1000)
-            else:
-                end_date = int(datetime.fromisoformat(end_date.replace('Z', '+00:00')).timestamp() * 1000)
-            
-            payload = {
-                "startDate": start_date,
-                "endDate": end_date
-            }
+    def backfill_usage_frame(self, start_ms: int, end_ms: int, window_days: int = None, max_workers: int = None,
+                             checkpoint_dir: str = None, batch_size: int = None, force: bool = False) -> pd.DataFrame:
+        """Fetch any range as concurrent fixed-size windows, streaming each response into a DataFrame.
+
+        Finished windows are checkpointed to disk so an interrupted backfill
+        resumes without re-fetching them. Pass checkpoint_dir='' to disable,
+        or force=True to fetch every window from the API and overwrite its
+        checkpoint. Records are parsed incrementally from the response body
+        and converted batch_size at a time, so peak memory is bounded by the
+        batch size rather than by the size of the response.
+        """
+        batch_size = batch_size or self.stream_batch_size
+        frames = self._map_windows(
+            lambda window, window_file, refresh: self._stream_window_frame(window, window_file, batch_size, refresh),
+            start_ms, end_ms, window_days, max_workers, checkpoint_dir, force
+        )
+        return self._concat_frames(frames)
+
+    def _map_windows(self, fetch_window, start_ms: int, end_ms: int, window_days: int = None,
+                     max_workers: int = None, checkpoint_dir: str = None, force: bool = False) -> List:
+        """Run fetch_window(window, checkpoint_file, force) for every window on a bounded thread pool"""
+        windows = self._split_into_windows(start_ms, end_ms, window_days or self.window_days)
+        if checkpoint_dir is None:
+            checkpoint_dir = self.checkpoint_dir
+        checkpoint_path = self._checkpoint_path(checkpoint_dir) if checkpoint_dir else None
+        # Windows touching the last two days are still changing and are never checkpointed
+        stable_before_ms = int(get_current_datetime().timestamp() * 1000) - 2 * DAY_MS
+
+        def run_window(window: Tuple[int, int]):
+            window_file = None
+            if checkpoint_path and window[1] < stable_before_ms:
+                window_file = self._window_file(checkpoint_path, window)
+            return fetch_window(window, window_file, force)
+
+        workers = max(1, min(max_workers or self.max_workers, len(windows)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(run_window, windows))
+
+    def _stream_window_frame(self, window: Tuple[int, int], window_file: Optional[str],
+                             batch_size: int, force: bool = False) -> pd.DataFrame:
+        """Stream one window into a DataFrame, sharing any identical fetch already in flight"""
+        return self.flight.do(('frame', window, force),
+                              lambda: _timed_window(self._load_window_frame, window, window_file, batch_size, force))
+
+    def _load_window_frame(self, window: Tuple[int, int], window_file: Optional[str],
+                           batch_size: int, force: bool = False) -> pd.DataFrame:
+        """Stream one window into a DataFrame, teeing the raw body into its checkpoint unless reading it back"""
+        if window_file and not force:
+            try:
+                with open(window_file, 'rb') as f:
+                    return self._frame_from_chunks(iter(lambda: f.read(STREAM_CHUNK_BYTES), b''), batch_size)
+            except FileNotFoundError:
+                # Never written, or deleted by a run that has just stored the window
+                pass
+        
+        with self._request_usage_window(*window, stream=True) as response:
+            chunks = _count_bytes(response.iter_content(chunk_size=STREAM_CHUNK_BYTES))
+            if not window_file:
+                return self._frame_from_chunks(chunks, batch_size)
+            # Write then rename so a killed process never leaves a partial checkpoint
+            tmp_file = f"{window_file}.tmp"
+            with open(tmp_file, 'wb') as f:
+                frame = self._frame_from_chunks(_tee_chunks(chunks, f), batch_size)
+            os.replace(tmp_file, window_file)
+            return frame
+
+    def _frame_from_chunks(self, chunks, batch_size: int) -> pd.DataFrame:
+        """Convert streamed response chunks to a DataFrame batch by batch"""
+        return self._concat_frames([
+            self._convert_cursor_data_to_dashboard_frame({'data': batch})
+            for batch in iter_record_batches(chunks, batch_size)
+        ])
+
+    def _concat_frames(self, frames: List[pd.DataFrame]) -> pd.DataFrame:
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return self._convert_cursor_data_to_dashboard_frame({})
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
+
+    @staticmethod
+    def _split_into_windows(start_ms: int, end_ms: int, window_days: int) -> List[Tuple[int, int]]:
+        """Split [start_ms, end_ms] into windows aligned to a fixed UTC-day grid"""
+        window_ms = max(window_days, 1) * DAY_MS
+        windows = []
+        # Aligning to the epoch grid keeps interior windows identical across runs,
+        # so checkpoints stay valid when "now" (and thus the range edges) moves.
+        boundary = (start_ms // window_ms) * window_ms
+        while boundary <= end_ms:
+            window_start = max(boundary, start_ms)
+            window_end = min(boundary + window_ms - 1, end_ms)
+            windows.append((window_start, window_end))
+            boundary += window_ms
+        return windows
+
+    def clear_checkpoints(self, start_ms: int, end_ms: int, window_days: int = None, checkpoint_dir: str = None):
+        """Delete the checkpoints of a range's windows, once their rows are safely stored"""
+        if checkpoint_dir is None:
+            checkpoint_dir = self.checkpoint_dir
+        if not checkpoint_dir:
+            return
+        path = os.path.join(checkpoint_dir, get_team_key(self.base_url, self.api_key))
+        for window in self._split_into_windows(start_ms, end_ms, window_days or self.window_days):
+            try:
+                os.remove(self._window_file(path, window))
+            except FileNotFoundError:
+                pass
+
+    def _checkpoint_path(self, checkpoint_dir: str) -> str:
+        """Get the per-team checkpoint directory, creating it if needed"""
+        path = os.path.join(checkpoint_dir, get_team_key(self.base_url, self.api_key))
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    @staticmethod
+    def _window_file(checkpoint_path: str, window: Tuple[int, int]) -> str:
+        return os.path.join(checkpoint_path, f"{window[0]}-{window[1]}.json")
+
+    def _request_usage_window(self, start_ms: int, end_ms: int, stream: bool = False) -> requests.Response:
+        """POST a single window to the API, retrying with backoff on transient failures"""
+        payload = {
+            "startDate": start_ms,
+            "endDate": end_ms
+        }
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.post(
+                    f"{self.base_url}/teams/daily-usage-data",
+                    json=payload,
+                    timeout=self.timeout,
+                    stream=stream
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                increment('api_requests_total', help_text='Cursor Admin API requests by team and outcome',
+                          team=self.team, outcome='connection_error')
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff_delay(attempt))
+                continue
             
-            response = self.session.post(
-                f"{self.base_url}/teams/daily-usage-data",
-                json=payload,
-                timeout=30
-            )
+            increment('api_requests_total', help_text='Cursor Admin API requests by team and outcome',
+                      team=self.team, outcome=str(response.status_code))
+            if response.status_code in RETRYABLE_STATUS_CODES and attempt < self.max_retries:
+                retry_after = self._parse_retry_after(response.headers.get('Retry-After'))
+                if retry_after is not None and retry_after > self.max_retry_after:
+                    # A huge or bogus header must not park this worker for as long as the server says
+                    logger.warning("Capping Retry-After of %gs for team %s to %gs",
+                                   retry_after, self.team, self.max_retry_after)
+                    retry_after = self.max_retry_after
+                # Read the short error body so a streamed response returns its connection to the pool
+                response.content
+                response.close()
+                time.sleep(retry_after if retry_after is not None else self._backoff_delay(attempt))
+                continue
             
             response.raise_for_status()
-            cursor_data = response.json()
-
-            dashboard_data = self._convert_cursor_data_to_dashboard_format(cursor_data)
-            if not dashboard_data:
-                st.warning("No usage data found in API response. Check your date range and team activity.")
-            return dashboard_data
-        except Exception as e:
-            st.error(f"Failed to fetch usage data from Cursor Admin API: {e}")
-            st.info("Make sure you're using the correct API key from cursor.com/dashboard → Settings → Cursor Admin API Keys")
-            return []
-
-    def _convert_cursor_data_to_dashboard_format(self, cursor_data: Dict) -> List[Dict]:
-        """Convert Cursor API data to format needed for dashboard KPIs and chart"""
-        dashboard_data = []
-        tz = get_timezone()
-        if 'data' in cursor_data:
-            for day_data in cursor_data['data']:
-                # Convert timestamp from milliseconds to datetime
-                date_timestamp = day_data.get('date')
-                if date_timestamp:
-                    # Convert from milliseconds to datetime in configured timezone
-                    date_obj = datetime.fromtimestamp(date_timestamp / 1000, tz=tz)
-                    date_str = date_obj.isoformat()
-                else:
-                    date_str = get_current_datetime().isoformat()
-                
-                row = {
-                    'user': day_data.get('email', 'Unknown').split('@')[0].replace('.', ' ').title(),
-                    'email': day_data.get('email', ''),
-                    'date': date_str,
-                    'totalLinesAdded': day_data.get('totalLinesAdded', 0),
-                    'totalLinesDeleted': day_data.get('totalLinesDeleted', 0),
-                    'acceptedLinesAdded': day_data.get('acceptedLinesAdded', 0),
-                    'acceptedLinesDeleted': day_data.get('acceptedLinesDeleted', 0),
-                    'totalApplies': day_data.get('totalApplies', 0),
-                    'totalAccepts': day_data.get('totalAccepts', 0),
-                    'totalRejects': day_data.get('totalRejects', 0),
-                    'totalTabsShown': day_data.get('totalTabsShown', 0),
-                    'totalTabsAccepted': day_data.get('totalTabsAccepted', 0),
-                    'composerRequests': day_data.get('composerRequests', 0),
-                    'chatRequests': day_data.get('chatRequests', 0),
-                    'agentRequests': day_data.get('agentRequests', 0),
-                    'cmdkUsages': day_data.get('cmdkUsages', 0),
-                    'subscriptionIncludedReqs': day_data.get('subscriptionIncludedReqs', 0),
-                    'apiKeyReqs': day_data.get('apiKeyReqs', 0),
-                    'usageBasedReqs': day_data.get('usageBasedReqs', 0),
-                    'bugbotUsages': day_data.get('bugbotUsages', 0),
-                }
-                dashboard_data.append(row)
-        
-        return dashboard_data
+            return response
 
-def setup_api_config():
-    """Setup API configuration using environment variables"""
-    api_config = get_api_config()
-    
-    # Check if real API is configured
-    has_real_api = api_config['base_url'] and api_config['api_key']
-    
-    if has_real_api:
-        return {
-            'mode': 'real',
-            'base_url': api_config['base_url'],
-            'api_key': api_config['api_key']
-        }
-    else:
-        return {
-            'mode': 'mock',
-            'base_url': None,
-            'api_key': None
-        }
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, self.backoff_factor * (2 ** attempt))
 
-def get_api_data(config: Dict) -> pd.DataFrame:
-    """Get data from Cursor API for dashboard KPIs and chart"""
-    if config['mode'] == 'mock':
-        # Return empty DataFrame for mock mode - mock data should be in tests
-        st.warning("Mock mode enabled. Configure real API credentials for actual data.")
-        return pd.DataFrame()
-    else:
-        # Use real Cursor API
-        fetcher = CursorAPIFetcher(config['base_url'], config['api_key'])
-        raw_data = fetcher.fetch_usage_data()
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given either as seconds or as an HTTP date"""
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max((retry_at - datetime.now(retry_at.tzinfo)).total_seconds(), 0.0)
+
+    def _convert_cursor_data_to_dashboard_frame(self, cursor_data: Dict) -> pd.DataFrame:
+        """Convert Cursor API data to the usage DataFrame needed for dashboard KPIs and charts"""
+        records = cursor_data.get('data') or []
+        if not records:
+            return pd.DataFrame(columns=['team', 'user', 'email', 'date'] + USAGE_COUNTER_COLUMNS)
+        increment('rows_converted_total', len(records), 'API records converted to usage rows')
+        # Pull each field into its own column in a single pass over the records;
+        # this is several times faster than DataFrame.from_records on dicts
+        emails = pd.Series([record.get('email') for record in records], dtype=object)
         
-        # Convert to DataFrame
-        df = pd.DataFrame(raw_data)
+        # Derive display names once per unique email and map them back by code; the
+        # trailing entries are picked by the -1 code of missing emails
+        codes, unique_emails = pd.factorize(emails, sort=False)
+        names = np.array([email.split('@')[0].replace('.', ' ').title() for email in unique_emails] + ['Unknown'],
+                         dtype=object)
+        unique_emails = np.append(unique_emails.astype(object), '')
         
-        # Convert date strings to datetime
-        if 'date' in df.columns:
-            try:
-                df['date'] = pd.to_datetime(df['date'])
-            except Exception as e:
-                pass
+        # Dates stay in UTC epoch milliseconds; timezones are applied when viewing
+        timestamps = pd.to_numeric(pd.Series([record.get('date') for record in records], dtype=object), errors='coerce')
+        timestamps = timestamps.where(timestamps != 0)
+        if timestamps.isna().any():
+            timestamps = timestamps.fillna(int(get_current_datetime().timestamp() * 1000))
         
-        return df 
\ No newline at end of file
+        frame = {
+            'team': np.full(len(records), self.team, dtype=object),
+            'user': names[codes],
+            # Rows share one string object per unique email instead of one per record
+            'email': unique_emails[codes],
+            'date': timestamps.to_numpy(dtype='int64'),
+        }
+        for col in USAGE_COUNTER_COLUMNS:
+            try:
+                frame[col] = np.fromiter((record.get(col, 0) for record in records), dtype='int64', count=len(records))
+            except (TypeError, ValueError):
+                # Slow path for nulls or non-integer values in the payload
+                values = pd.Series([record.get(col) for record in records], dtype=object)
+                frame[col] = pd.to_numeric(values, errors='coerce').fillna(0).astype('int64').to_numpy()
+        return pd.DataFrame(frame)
+
+def _timed_window(load_window, *args):
+    """Run one window load inside an api_window span counting its rows"""
+    with span('api_window') as window_span:
+        result = load_window(*args)
+        window_span['rows'] = len(result)
+    return result
+
+def _count_bytes(chunks):
+    """Yield chunks unchanged while counting them as fetched bytes"""
+    for chunk in chunks:
+        increment('api_bytes_fetched_total', len(chunk), 'Response bytes read from the Cursor Admin API')
+        yield chunk
+
+def _tee_chunks(chunks, file):
+    """Yield chunks unchanged while also writing them to file"""
+    for chunk in chunks:
+        file.write(chunk)
+        yield chunk
+
+def get_mock_data() -> pd.DataFrame:
+    """Build the usage frame from seeded synthetic API payloads, split across MOCK_TEAMS teams"""
+    dev_config = get_dev_config()
+    payload = generate_usage_payload(
+        developers=dev_config['mock_developers'],
+        days=get_api_config()['history_days'] + 1,
+        seed=dev_config['mock_seed']
+    )
+    df = CursorAPIFetcher(base_url='mock', api_key='')._convert_cursor_data_to_dashboard_frame(payload)
+    if dev_config['mock_teams'] > 1:
+        # Deal developers round-robin into Team 1..N
+        codes, _ = pd.factorize(df['email'], sort=True)
+        df['team'] = np.array([f"Team {n + 1}" for n in range(dev_config['mock_teams'])], dtype=object)[
+            codes % dev_config['mock_teams']]
+    return compact_usage_frame(df)
@@ -0,0 +1,189 @@
+"""
+Local stand-in for the Cursor Admin API used for throughput and fault-injection tests.
+
+Implements POST /teams/daily-usage-data with Basic auth, serving synthetic data
+with configurable latency, rate limiting (429 + Retry-After) and injected
+5xx errors or hung requests.
+
+Usage:
+    python -m cursor_dashboard.api.mock_server --port 8787 --developers 500 --days 365 \\
+        --latency-ms 50 --rate-limit 20 --error-rate 0.05 --timeout-rate 0.01
+"""
+import argparse
+import base64
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from .synthetic import RECORD_FIELDS, generate_usage_columns
+
+class MockServerConfig:
+    """Behaviour knobs for the mock Cursor Admin API"""
+    
+    def __init__(self, api_key: str = 'mock-key', developers: int = 100, days: int = 365, seed: int = 42,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0, rate_limit: float = 0.0, retry_after: int = 1,
+                 error_rate: float = 0.0, timeout_rate: float = 0.0, timeout_seconds: float = 60.0):
+        self.api_key = api_key
+        self.developers = developers
+        self.days = days
+        self.seed = seed
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_seconds = timeout_seconds
+
+class MockCursorAPIServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding pre-serialized synthetic usage, one JSON fragment per day"""
+    
+    daemon_threads = True
+
+    def __init__(self, address, config: MockServerConfig):
+        super().__init__(address, MockCursorAPIHandler)
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.stats = {'requests': 0, 'ok': 0, 'unauthorized': 0, 'rate_limited': 0, 'errors': 0, 'timeouts': 0}
+        self._lock = threading.Lock()
+        self._tokens = float(config.rate_limit)
+        self._last_refill = time.monotonic()
+        self._day_ms, self._day_fragments = self._serialize_days()
+
+    def _serialize_days(self):
+        columns = generate_usage_columns(self.config.developers, self.config.days, seed=self.config.seed)
+        values = [columns[field].tolist() for field in RECORD_FIELDS]
+        fragments: Dict[int, List[str]] = {}
+        for row in zip(*values):
+            fragments.setdefault(row[0], []).append(json.dumps(dict(zip(RECORD_FIELDS, row))))
+        day_ms = sorted(fragments)
+        return day_ms, [','.join(fragments[day]).encode() for day in day_ms]
+
+    def body_for_range(self, start_ms: int, end_ms: int) -> bytes:
+        """Build the response body for the inclusive epoch-ms range"""
+        parts = [fragment for day, fragment in zip(self._day_ms, self._day_fragments) if start_ms <= day <= end_ms]
+        return b'{"data":[' + b','.join(parts) + b']}'
+
+    def take_token(self) -> bool:
+        """Token-bucket rate limiter; always succeeds when rate_limit is 0"""
+        if self.config.rate_limit <= 0:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.config.rate_limit, self._tokens + (now - self._last_refill) * self.config.rate_limit)
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def count(self, outcome: str):
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats[outcome] += 1
+
+    def roll(self) -> float:
+        with self._lock:
+            return self.random.random()
+
+class MockCursorAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        server: MockCursorAPIServer = self.server
+        config = server.config
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        
+        if self.path.rstrip('/') != '/teams/daily-usage-data':
+            return self._send_json(404, {'error': 'Not found'})
+        if not self._authorized(config.api_key):
+            server.count('unauthorized')
+            return self._send_json(401, {'error': 'Unauthorized'}, {'WWW-Authenticate': 'Basic'})
+        if not server.take_token():
+            server.count('rate_limited')
+            return self._send_json(429, {'error': 'Rate limit exceeded'}, {'Retry-After': str(config.retry_after)})
+        
+        roll = server.roll()
+        if roll < config.timeout_rate:
+            # Hang past the client's timeout, then drop the connection
+            server.count('timeouts')
+            time.sleep(config.timeout_seconds)
+            self.close_connection = True
+            return
+        if roll < config.timeout_rate + config.error_rate:
+            server.count('errors')
+            return self._send_json(503, {'error': 'Service unavailable'})
+        
+        try:
+            payload = json.loads(body or b'{}')
+            start_ms, end_ms = int(payload['startDate']), int(payload['endDate'])
+        except (ValueError, KeyError, TypeError):
+            return self._send_json(400, {'error': 'startDate and endDate (epoch ms) are required'})
+        
+        delay_ms = config.latency_ms + (server.random.uniform(0, config.jitter_ms) if config.jitter_ms else 0)
+        if delay_ms:
+            time.sleep(delay_ms / 1000)
+        server.count('ok')
+        self._send_body(200, server.body_for_range(start_ms, end_ms))
+
+    def _authorized(self, api_key: Optional[str]) -> bool:
+        if not api_key:
+            return True
+        expected = 'Basic ' + base64.b64encode(f"{api_key}:".encode()).decode()
+        return self.headers.get('Authorization') == expected
+
+    def _send_json(self, status: int, payload: Dict, headers: Dict = None):
+        self._send_body(status, json.dumps(payload).encode(), headers)
+
+    def _send_body(self, status: int, body: bytes, headers: Dict = None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_mock_server(config: MockServerConfig = None, host: str = '127.0.0.1', port: int = 0) -> MockCursorAPIServer:
+    """Start the mock server on a background thread; port 0 picks a free port"""
+    server = MockCursorAPIServer((host, port), config or MockServerConfig())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m cursor_dashboard.api.mock_server',
+                                     description='Local stand-in for the Cursor Admin API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--api-key', default='mock-key', help="Expected Basic auth user; '' disables auth")
+    parser.add_argument('--developers', type=int, default=100)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='Requests per second, 0 for unlimited')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds sent with 429')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 503')
+    parser.add_argument('--timeout-rate', type=float, default=0.0, help='Fraction of requests that hang')
+    parser.add_argument('--timeout-seconds', type=float, default=60.0)
+    args = parser.parse_args(argv)
+    
+    config = MockServerConfig(**{key: value for key, value in vars(args).items() if key not in ('host', 'port')})
+    server = MockCursorAPIServer((args.host, args.port), config)
+    print(f"Mock Cursor Admin API on http://{args.host}:{server.server_port} "
+          f"({config.developers} developers x {config.days} days)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.stats))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Incremental parsing of large JSON responses.
+
+The Cursor Admin API returns `{"data": [record, ...], ...}`. Instead of holding
+the whole body and object tree in memory, records are decoded one at a time as
+chunks arrive and handed out in fixed-size batches.
+"""
+import codecs
+import json
+from typing import Dict, Iterable, Iterator, List
+
+_WHITESPACE = ' \t\n\r'
+# Characters that may legally follow a complete JSON value
+_VALUE_TERMINATORS = _WHITESPACE + ',]}:'
+_DECODER = json.JSONDecoder()
+
+class _ChunkBuffer:
+    """Text buffer over an iterable of byte chunks with incremental UTF-8 decoding"""
+    
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.pos = 0
+        self.exhausted = False
+
+    def fill(self) -> bool:
+        """Read another chunk, dropping consumed text; returns False at end of stream"""
+        if self.exhausted:
+            return False
+        self.text = self.text[self.pos:]
+        self.pos = 0
+        try:
+            chunk = next(self._chunks)
+            self.text += self._decoder.decode(chunk)
+        except StopIteration:
+            self.text += self._decoder.decode(b'', final=True)
+            self.exhausted = True
+        return True
+
+    def next_char(self) -> str:
+        """Skip whitespace and peek the next significant character ('' at end of stream)"""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str):
+        if self.next_char() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} of streamed JSON")
+        self.pos += 1
+
+    def decode_value(self):
+        """Decode the next complete JSON value, reading more chunks as needed"""
+        self.next_char()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, self.pos)
+                # A number could continue in the next chunk; only trust values followed by a terminator
+                if self.exhausted or (end < len(self.text) and self.text[end] in _VALUE_TERMINATORS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.exhausted:
+                    raise
+            self.fill()
+
+def iter_json_array_items(chunks: Iterable[bytes], key: str = 'data') -> Iterator:
+    """Yield items of the top-level array (or of the array under `key` of a top-level object)"""
+    buffer = _ChunkBuffer(chunks)
+    first = buffer.next_char()
+    if first == '{':
+        buffer.pos += 1
+        while True:
+            if buffer.next_char() == '}':
+                return
+            name = buffer.decode_value()
+            buffer.expect(':')
+            if name == key and buffer.next_char() == '[':
+                break
+            buffer.decode_value()
+            if buffer.next_char() == ',':
+                buffer.pos += 1
+    elif first != '[':
+        raise ValueError("Streamed JSON must be an object or an array")
+    
+    buffer.expect('[')
+    if buffer.next_char() == ']':
+        return
+    while True:
+        yield buffer.decode_value()
+        separator = buffer.next_char()
+        buffer.pos += 1
+        if separator == ']':
+            return
+        if separator != ',':
+            raise ValueError(f"Expected ',' or ']' at offset {buffer.pos} of streamed JSON")
+
+def iter_record_batches(chunks: Iterable[bytes], batch_size: int, key: str = 'data') -> Iterator[List[Dict]]:
+    """Group streamed array items into lists of at most batch_size"""
+    batch = []
+    for record in iter_json_array_items(chunks, key):
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
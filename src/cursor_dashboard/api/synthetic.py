@@ -0,0 +1,110 @@
+"""
+Deterministic synthetic Cursor Admin API daily-usage-data payloads.
+
+Activity is skewed the way real teams are: a few heavy users, a long tail of
+occasional ones, quiet weekends, and per-developer habits for tab acceptance,
+request mix and billing. The same seed always yields the same payload.
+"""
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterator, List
+import numpy as np
+from ..utils.dates import DAY_MS
+
+FIRST_NAMES = ['alex', 'sam', 'jordan', 'taylor', 'morgan', 'casey', 'riley', 'jamie', 'avery', 'quinn',
+               'nimal', 'kasun', 'dilini', 'priya', 'arjun', 'mei', 'hana', 'lucas', 'sofia', 'omar']
+LAST_NAMES = ['perera', 'silva', 'fernando', 'smith', 'jones', 'garcia', 'kim', 'chen', 'patel', 'nguyen',
+              'muller', 'rossi', 'tanaka', 'haddad', 'okafor', 'larsen', 'novak', 'costa', 'dubois', 'reyes']
+
+# Field order of a daily-usage-data record
+RECORD_FIELDS = [
+    'date', 'email', 'isActive',
+    'totalLinesAdded', 'totalLinesDeleted', 'acceptedLinesAdded', 'acceptedLinesDeleted',
+    'totalApplies', 'totalAccepts', 'totalRejects', 'totalTabsShown', 'totalTabsAccepted',
+    'composerRequests', 'chatRequests', 'agentRequests', 'cmdkUsages',
+    'subscriptionIncludedReqs', 'apiKeyReqs', 'usageBasedReqs', 'bugbotUsages'
+]
+
+def synthetic_emails(developers: int) -> List[str]:
+    """Build unique, realistic-looking developer emails"""
+    emails = []
+    for i in range(developers):
+        first = FIRST_NAMES[i % len(FIRST_NAMES)]
+        last = LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]
+        suffix = i // (len(FIRST_NAMES) * len(LAST_NAMES))
+        emails.append(f"{first}.{last}{suffix or ''}@example.com")
+    return emails
+
+def generate_usage_columns(developers: int = 50, days: int = 30, end_date: date = None,
+                           seed: int = 42) -> Dict[str, np.ndarray]:
+    """Generate usage as flat columns ordered day by day, then developer by developer"""
+    rng = np.random.default_rng(seed)
+    end_date = end_date or datetime.now(timezone.utc).date()
+    start_date = end_date - timedelta(days=days - 1)
+    start_ms = int(datetime(start_date.year, start_date.month, start_date.day, tzinfo=timezone.utc).timestamp() * 1000)
+    day_ms = start_ms + np.arange(days, dtype='int64') * DAY_MS
+    
+    # Per-developer habits; lognormal intensity gives a heavy-tailed activity distribution
+    intensity = rng.lognormal(mean=0.0, sigma=1.0, size=developers)
+    engagement = rng.beta(2.0, 1.5, size=developers)
+    tab_accept_rate = rng.beta(3.0, 5.0, size=developers)
+    line_accept_rate = rng.beta(4.0, 3.0, size=developers)
+    apply_accept_rate = rng.beta(5.0, 2.0, size=developers)
+    request_mix = rng.dirichlet([2.0, 3.0, 2.5, 1.0], size=developers)
+    uses_own_key = rng.random(developers) < 0.05
+    
+    # Weekends are quiet; shape is (days, developers)
+    weekdays = (np.arange(days) + start_date.weekday()) % 7
+    day_factor = np.where(weekdays >= 5, 0.15, 1.0)
+    active = rng.random((days, developers)) < engagement[None, :] * day_factor[:, None]
+    scale = intensity[None, :] * active
+    
+    tabs_shown = rng.poisson(40 * scale)
+    lines_added = rng.poisson(120 * scale)
+    lines_deleted = rng.poisson(45 * scale)
+    applies = rng.poisson(8 * scale)
+    accepts = rng.binomial(applies, apply_accept_rate[None, :])
+    requests = rng.poisson(25 * scale)
+    mix = rng.multinomial(requests, request_mix[None, :, :])
+    
+    # Requests beyond the daily included allowance are usage-based; some developers bring their own key
+    included = np.minimum(requests, 50)
+    api_key = np.where(uses_own_key[None, :], requests, 0)
+    included = np.where(uses_own_key[None, :], 0, included)
+    
+    columns = {
+        'date': np.repeat(day_ms, developers),
+        'isActive': active,
+        'totalLinesAdded': lines_added,
+        'totalLinesDeleted': lines_deleted,
+        'acceptedLinesAdded': rng.binomial(lines_added, line_accept_rate[None, :]),
+        'acceptedLinesDeleted': rng.binomial(lines_deleted, line_accept_rate[None, :]),
+        'totalApplies': applies,
+        'totalAccepts': accepts,
+        'totalRejects': rng.binomial(applies - accepts, 0.6),
+        'totalTabsShown': tabs_shown,
+        'totalTabsAccepted': rng.binomial(tabs_shown, tab_accept_rate[None, :]),
+        'composerRequests': mix[..., 0],
+        'chatRequests': mix[..., 1],
+        'agentRequests': mix[..., 2],
+        'cmdkUsages': mix[..., 3],
+        'subscriptionIncludedReqs': included,
+        'apiKeyReqs': api_key,
+        'usageBasedReqs': requests - included - api_key,
+        'bugbotUsages': rng.poisson(0.2 * scale),
+    }
+    columns = {name: values.reshape(-1) for name, values in columns.items()}
+    columns['email'] = np.tile(np.array(synthetic_emails(developers), dtype=object), days)
+    return columns
+
+def iter_usage_records(developers: int = 50, days: int = 30, end_date: date = None,
+                       seed: int = 42) -> Iterator[Dict]:
+    """Yield daily-usage-data records one at a time"""
+    columns = generate_usage_columns(developers, days, end_date, seed)
+    values = [columns[field].tolist() for field in RECORD_FIELDS]
+    for row in zip(*values):
+        yield dict(zip(RECORD_FIELDS, row))
+
+def generate_usage_payload(developers: int = 50, days: int = 30, end_date: date = None,
+                           seed: int = 42) -> Dict:
+    """Generate a full daily-usage-data response body"""
+    return {'data': list(iter_usage_records(developers, days, end_date, seed))}
@@ -1,95 +1,457 @@
+import tempfile
 import streamlit as st
 import pandas as pd
-from .api.integration import setup_api_config, get_api_data
-from .config.settings import DASHBOARD_CONFIG
+from datetime import timedelta
+from .config.settings import (
+    DASHBOARD_CONFIG, TIMEZONE_CONFIG, get_api_config, get_cache_config, get_current_datetime, get_dev_config,
+    get_storage_config, get_team_key, get_timezone, get_timezone_names, setup_api_config
+)
+from .storage.usage_store import get_usage_store, load_usage_frame
 from .utils.ui_utils import load_css, create_header
-from .utils.data_processing import calculate_kpis, filter_data_by_date, prepare_chart_data
+from .utils.data_processing import (
+    USAGE_COUNTER_COLUMNS, calculate_kpis, get_date_range, get_page_count, page_chart_data, prepare_chart_data, search_chart_data,
+    sort_by_date, top_n_chart_data
+)
+from .utils.rollups import UsageRollup
+from .utils.trends import TREND_METRICS, prepare_developer_trends, prepare_team_trend
+from .utils.developer_profile import prepare_developer_profile
+from .utils.data_cache import StaleWhileRevalidateCache
+from .utils.metrics import METRICS, export_metrics, span, start_trace
 from .components.kpi_cards import display_kpi_cards
-from .components.charts import create_lines_accepted_chart
-
-# Page configuration
-st.set_page_config(
-    page_title=DASHBOARD_CONFIG['title'],
-    page_icon="📊",
-    layout="wide",
-    initial_sidebar_state="expanded",
-    menu_items={
-        'Get Help': None,
-        'Report a bug': None,
-        'About': None
+from .components.charts import create_feature_mix_chart, create_funnel_chart, create_lines_accepted_chart, create_trend_chart
+
+@st.cache_resource
+def get_data_cache():
+    """Get the process-wide dashboard data cache"""
+    return StaleWhileRevalidateCache(
+        ttl_seconds=get_cache_config()['ttl_seconds'],
+        background_refresh=get_dev_config()['auto_refresh_data']
+    )
+
+@st.cache_resource
+def get_api_fetcher(base_url, api_key, team=None, rate_limit=None):
+    """Get the process-wide pooled, rate-limited Cursor API client for a team, shared by every session"""
+    # Imported here so a read-only dashboard never loads the HTTP client stack
+    from .api.integration import CursorAPIFetcher
+    return CursorAPIFetcher(base_url, api_key, team, rate_limit)
+
+@st.cache_resource
+def get_shared_usage_store():
+    """Get the process-wide usage store, so every session and load reuses one client and its connection pool"""
+    return get_usage_store()
+
+def get_team_fetchers(api_config):
+    """Get the shared API client of every configured team by team name"""
+    return {
+        team['name']: get_api_fetcher(team['base_url'], team['api_key'], team['name'], team['rate_limit'])
+        for team in api_config.get('teams', [])
     }
-)
 
-# Load CSS styles
-load_css()
+def _build_rollups(df, store=None):
+    """Build the org-wide rollup under None and, with several teams, one rollup per team"""
+    rollups = {None: UsageRollup(df, store.load_activity() if store else None)}
+    teams = df['team'].cat.categories.tolist() if 'team' in df.columns and not df.empty else []
+    if len(teams) > 1:
+        for team in teams:
+            rows = df[df['team'] == team]
+            rollups[team] = UsageRollup(rows, store.load_activity(team) if store else None)
+    return rollups
 
-# Initialize session state
-if 'api_config' not in st.session_state:
-    st.session_state.api_config = None
+def _load_data_uncached(api_config, fetchers=None, store=None):
+    """Load data from the usage store and build its rollups once per load.
+
+    Returns (df, rollups, notices) where rollups maps None to the org-wide
+    rollup and, with several teams, each team name to that team's rollup. With
+    the Mongo backend a snapshot of the store and its team views serve as the
+    rollups, caching each range's aggregations until the next load, and df is
+    empty. Notices are shown by the caller because this may run on a
+    background refresh thread.
+    """
+    notices = []
+    if api_config.get('mode') == 'real':
+        store = store or get_usage_store()
+        if get_storage_config()['sync_on_load']:
+            try:
+                from .ingest.core import ingest
+                ingest(config=api_config, store=store, fetchers=fetchers)
+            except Exception as e:
+                # Fall back to whatever is already stored locally
+                notices.append(f"Could not sync usage data from Cursor Admin API, showing stored data: {e}")
+        if get_storage_config()['backend'] == 'mongo':
+            # The store answers range queries with server-side aggregations, so daily rows stay in Mongo
+            snapshot = store.snapshot()
+            if snapshot.empty:
+                notices.append("No usage data found in the usage store. Check your date range and team activity.")
+            teams = snapshot.teams()
+            rollups = {None: snapshot, **({team: snapshot.for_team(team) for team in teams} if len(teams) > 1 else {})}
+            return pd.DataFrame(), rollups, notices
+        with span('load_store') as load_span:
+            df = load_usage_frame(store)
+            load_span['rows'] = len(df)
+        if df.empty:
+            notices.append("No usage data found in the local store. Check your date range and team activity.")
+    elif get_dev_config()['enable_mock_data']:
+        from .api.integration import get_mock_data
+        with span('mock_data') as mock_span:
+            df = get_mock_data()
+            mock_span['rows'] = len(df)
+        store = None
+        notices.append("Mock mode: showing synthetic data. Configure real API credentials for actual data.")
+    else:
+        df = pd.DataFrame()
+        store = None
+        notices.append("Mock mode enabled. Configure real API credentials for actual data.")
+    # Sort by date once so range filters can binary-search instead of masking
+    with span('build_rollup') as rollup_span:
+        df = sort_by_date(df)
+        rollups = _build_rollups(df, store)
+        rollup_span['rows'] = len(df)
+    return df, rollups, notices
 
 # Load data based on source
-@st.cache_data
-def load_data():
-    """Load data from the configured source"""
-    try:
-        # Check if API config exists and use real API if configured
-        if st.session_state.api_config and st.session_state.api_config.get('mode') == 'real':
-            return get_api_data(st.session_state.api_config)
-        else:
-            return get_api_data({'mode': 'mock'})
-    except Exception as e:
-        st.error(f"Error loading data: {e}")
-        return get_api_data({'mode': 'mock'})
-
-
-
-def show_dashboard(df):
-    """Display simplified dashboard with only specified features"""
-    if df.empty:
+def load_data(api_config):
+    """Load data keyed by the configured teams and history range, serving stale data while it refreshes.
+
+    Every session shares one cache, so concurrent cold loads wait on a single fetch.
+    """
+    api_config = api_config or {'mode': 'mock'}
+    fetchers = None
+    store = None
+    teams = ('mock',)
+    if api_config.get('mode') == 'real':
+        teams = tuple(get_team_key(team['base_url'], team['api_key']) for team in api_config['teams'])
+        # Resolved on the script thread; the loader may run on a background refresh thread
+        store = get_shared_usage_store()
+        if get_storage_config()['sync_on_load']:
+            fetchers = get_team_fetchers(api_config)
+    key = (teams, get_api_config()['history_days'])
+    (df, rollups, notices), loaded_at = get_data_cache().get(
+        key, lambda: _load_data_uncached(api_config, fetchers, store)
+    )
+    return df, rollups, notices, loaded_at, get_data_cache().is_refreshing(key)
+
+
+
+def lines_accepted_view(chart_data):
+    """Render the developer chart controls and return the rows to draw with a key identifying them"""
+    top_n = DASHBOARD_CONFIG['chart_top_n']
+    if len(chart_data) <= top_n:
+        return chart_data, ('all',)
+    
+    view = st.radio('Developers', [f'Top {top_n}', 'Browse all'], horizontal=True, label_visibility="collapsed")
+    if view != 'Browse all':
+        return top_n_chart_data(chart_data, top_n), ('top', top_n)
+    
+    # Only the current page is turned into a figure and sent to the browser
+    page_size = DASHBOARD_CONFIG['chart_page_size']
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        search = st.text_input('🔍 Search developers', placeholder='Search developers', label_visibility="collapsed")
+    ranked = search_chart_data(chart_data, search.strip())
+    page_count = get_page_count(len(ranked), page_size)
+    with col2:
+        page = st.number_input(f'Page (of {page_count})', min_value=1, max_value=page_count, value=1, step=1)
+    return page_chart_data(ranked, page, page_size), ('page', page_size, search.strip(), page)
+
+def show_dashboard(rollup, date_range, loaded_at=None, team=None, team_rollups=None):
+    """Display simplified dashboard with only specified features for one team or the whole organisation"""
+    if rollup.empty:
         st.error("No data available for analysis.")
         return
     
-
+    # Calculate KPIs from the rollup using modular function
+    with span('calculate_kpis'):
+        kpis = calculate_kpis(rollup, date_range)
     
-    # Calculate KPIs using modular function
-    kpis = calculate_kpis(df)
+    if not kpis['total_developers']:
+        start_day, end_day = date_range
+        st.info(f"No usage data between {start_day:%d %b %Y} and {end_day:%d %b %Y}. Try a wider time range.")
+        return
     
     # Display KPI cards using modular component
-    display_kpi_cards(
-        kpis['total_developers'],
-        kpis['active_developers'],
-        kpis['avg_lines_per_dev'],
-        kpis['acceptance_ratio']
-    )
+    with span('render_kpi_cards'):
+        display_kpi_cards(kpis)
+    
+    if team_rollups:
+        show_team_breakdown(team_rollups, date_range)
     
     # Chart: Number of lines accepted by user
     st.markdown("<div style='margin: 2rem 0 1rem 0;'></div>", unsafe_allow_html=True)
     st.markdown("### 📈 Lines Accepted by Developer")
     
-    # Prepare chart data using modular function
-    chart_data = prepare_chart_data(df)
+    # Prepare chart data from the rollup using modular function
+    with span('prepare_chart_data') as chart_span:
+        chart_data = prepare_chart_data(rollup, date_range)
+        chart_span['rows'] = len(chart_data)
+    view_data, view_key = lines_accepted_view(chart_data)
     
-    # Create chart using modular component
-    create_lines_accepted_chart(chart_data)
+    # Create chart using modular component; the figure is reused while the data, team, range and page are unchanged
+    data_key = (loaded_at, team)
+    with span('render_lines_chart') as render_span:
+        create_lines_accepted_chart(view_data, cache_key=(data_key, date_range) + view_key)
+        render_span['rows'] = len(view_data)
+    
+    show_trends(rollup, date_range, chart_data, data_key)
+    show_developer_drilldown(rollup, date_range, chart_data, data_key)
+
+def show_team_breakdown(team_rollups, date_range):
+    """Show the headline KPIs of every team side by side"""
+    with span('team_breakdown'):
+        rows = []
+        for team, team_rollup in team_rollups.items():
+            kpis = calculate_kpis(team_rollup, date_range)
+            rows.append({
+                'Team': team,
+                'Developers': kpis['total_developers'],
+                'Active': kpis['active_developers'],
+                'Avg Lines/Dev': round(kpis['avg_lines_per_dev']),
+                'Acceptance %': round(kpis['acceptance_ratio'], 1),
+                'AI Requests': kpis['total_requests']
+            })
+    st.markdown("<div style='margin: 2rem 0 1rem 0;'></div>", unsafe_allow_html=True)
+    st.markdown("### 👥 Teams")
+    st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+
+def show_trends(rollup, date_range, chart_data, data_key=None):
+    """Display team-wide and per-developer usage trends for the selected range"""
+    st.markdown("<div style='margin: 2rem 0 1rem 0;'></div>", unsafe_allow_html=True)
+    st.markdown("### 📉 Usage Trends")
+    metric = st.selectbox('Trend metric', list(TREND_METRICS), label_visibility="collapsed")
+    
+    # Resampled to day, week or month before plotting
+    with span('prepare_trends') as trend_span:
+        team_trend = prepare_team_trend(rollup, metric, date_range)
+        trend_span['rows'] = len(team_trend)
+    if not team_trend.empty:
+        st.caption(f"Team total per {team_trend['Resolution'].iloc[0]}")
+    with span('render_trends'):
+        create_trend_chart(team_trend, metric, cache_key=('team', data_key, date_range))
+    
+    with st.expander("Per developer"):
+        ranked = chart_data['Developer'].astype(str).tolist()
+        developers = st.multiselect(
+            'Developers',
+            ranked,
+            default=ranked[:DASHBOARD_CONFIG['trend_default_developers']],
+            label_visibility="collapsed"
+        )
+        with span('prepare_developer_trends') as trend_span:
+            developer_trends = prepare_developer_trends(
+                rollup, metric, developers, date_range, max_points=DASHBOARD_CONFIG['trend_max_points']
+            )
+            trend_span['rows'] = len(developer_trends)
+        with span('render_developer_trends'):
+            create_trend_chart(developer_trends, metric, color='Developer',
+                               cache_key=('developers', data_key, date_range, tuple(developers)))
+
+def show_developer_drilldown(rollup, date_range, chart_data, data_key=None):
+    """Display one developer's daily timeline, feature mix, acceptance funnel and streaks for the selected range"""
+    st.markdown("<div style='margin: 2rem 0 1rem 0;'></div>", unsafe_allow_html=True)
+    st.markdown("### 🔎 Developer Drill-down")
+    # Ranked like the lines accepted chart, so the options change with the range; the pick is carried over
+    ranked = chart_data['Developer'].astype(str).tolist()
+    previous = st.session_state.get('drilldown_developer')
+    developer = st.selectbox(
+        'Developer',
+        ranked,
+        index=ranked.index(previous) if previous in ranked else None,
+        placeholder='Choose a developer',
+        label_visibility="collapsed"
+    )
+    st.session_state.drilldown_developer = developer
+    # Nothing is prepared until a developer is picked
+    if developer is None:
+        return
+    
+    # A slice of the per-developer index, not a scan of every developer's rows
+    with span('prepare_developer_profile'):
+        profile = prepare_developer_profile(rollup, developer, date_range)
+    if profile is None:
+        return
+    
+    totals = profile['totals']
+    lines = profile['funnel'].set_index('Step').loc['Lines']
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric('Accepted Lines', f"{int(totals['acceptedLinesAdded']):,}")
+    col2.metric('Acceptance', f"{lines['Rate']:.1f}%")
+    col3.metric('Active Days', f"{profile['active_days']} / {profile['days']}")
+    col4.metric('Longest Streak', f"{profile['longest_streak']}d")
+    col5.metric('Current Streak', f"{profile['current_streak']}d")
+    
+    cache_key = (data_key, date_range, developer)
+    with span('render_developer_profile'):
+        create_trend_chart(profile['timeline'], 'Count', color='Metric', cache_key=('drilldown',) + cache_key)
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**Feature mix**")
+            create_feature_mix_chart(profile['feature_mix'], cache_key=cache_key)
+        with col2:
+            st.markdown("**Acceptance funnel**")
+            create_funnel_chart(profile['funnel'], cache_key=cache_key)
+
+def team_picker(rollups):
+    """Render the sidebar team picker when several teams are loaded and return the chosen team, None for all"""
+    teams = [team for team in rollups if team is not None]
+    if not teams:
+        return None
+    choice = st.sidebar.selectbox('👥 Team', ['All teams'] + teams, key='team')
+    return None if choice == 'All teams' else choice
+
+def timezone_picker():
+    """Render the per-session timezone picker and return the chosen timezone"""
+    names = get_timezone_names()
+    default = TIMEZONE_CONFIG['default_timezone']
+    name = st.sidebar.selectbox(
+        '🌐 Timezone',
+        names,
+        index=names.index(default) if default in names else 0,
+        key='timezone',
+        help="Used for today's date and timestamps. Usage is reported per UTC day."
+    )
+    return get_timezone(name)
+
+def _complete_range(picked):
+    """Return a date range picker's value as (start_day, end_day), or None until both ends are chosen"""
+    # The picker returns a single date while the user is still choosing the end
+    if isinstance(picked, (list, tuple)) and len(picked) == 2:
+        return tuple(picked)
+    return None
+
+def custom_range_picker(rollup, tz=None):
+    """Render the custom start/end picker and return the chosen (start_day, end_day).
+
+    While only a start date is picked, the last complete range stays in use.
+    """
+    min_day, max_day = rollup.date_bounds()
+    today = get_current_datetime(tz).date()
+    min_day, max_day = min_day or today, max(max_day or today, today)
+    default = (max(min_day, max_day - timedelta(days=29)), max_day)
+    picked = st.date_input(
+        '📅 Custom Range',
+        value=default,
+        min_value=min_day,
+        max_value=max_day,
+        label_visibility="collapsed"
+    )
+    complete = _complete_range(picked)
+    if complete:
+        st.session_state.custom_range = complete
+        return complete
+    last = st.session_state.get('custom_range', default)
+    st.caption(f"Select an end date · showing {last[0]:%d %b %Y} – {last[1]:%d %b %Y}")
+    return last
+
+def show_debug_panel(api_config, trace):
+    """Show this run's stage timings, cache and request coalescing counters and process totals in the sidebar"""
+    with st.sidebar.expander("🛠 Debug timings", expanded=True):
+        if trace:
+            spans = pd.DataFrame(trace)
+            spans['ms'] = (spans.pop('seconds') * 1000).round(1)
+            spans['rows'] = spans['rows'].astype('Int64') if 'rows' in spans else pd.NA
+            st.dataframe(spans[['stage', 'ms', 'rows']], hide_index=True, use_container_width=True)
+            st.caption("Stages include the stages nested in them · chart drawing in the browser is not included")
+        
+        cache_stats = get_data_cache().stats()
+        st.caption(
+            f"Cache: {cache_stats['hits']} hits · {cache_stats['loads_issued']} loads issued · "
+            f"{cache_stats['loads_coalesced']} coalesced"
+        )
+        if api_config.get('mode') == 'real' and get_storage_config()['sync_on_load']:
+            for team, fetcher in get_team_fetchers(api_config).items():
+                request_stats = fetcher.flight.stats()
+                st.caption(f"API windows ({team}): {request_stats['issued']} issued · {request_stats['coalesced']} coalesced")
+        
+        counters = METRICS.counters()
+        if counters:
+            st.caption("Process totals")
+            st.dataframe(pd.DataFrame([
+                {'metric': name + (f"{{{', '.join(f'{k}={v}' for k, v in labels)}}}" if labels else ''), 'value': value}
+                for (name, labels), value in sorted(counters.items())
+            ]), hide_index=True, use_container_width=True)
+
+def show_export_panel(api_config, df, date_range, team=None):
+    """Render the sidebar export form for one team or all of them and offer the finished file for download.
+
+    Streamlit holds a download's data in server memory, so the file is handed
+    to the download button only in the run that prepared it and then closed;
+    a later rerun drops the button and the viewer prepares the export again.
+    """
+    # Imported here so pages that never export skip the export module
+    from .export.core import EXPORT_FORMATS, export_usage, parquet_available
+    
+    with st.sidebar.expander("⬇️ Export usage"):
+        levels = {'Daily rows': 'day', 'Weekly per developer': 'week', 'Monthly per developer': 'month'}
+        level = levels[st.selectbox('Rows', list(levels))]
+        formats = {name.upper(): name for name in EXPORT_FORMATS if name != 'parquet' or parquet_available()}
+        export_format = formats[st.selectbox('Format', list(formats))]
+        columns = st.multiselect('Columns', USAGE_COUNTER_COLUMNS, default=USAGE_COUNTER_COLUMNS)
+        picked = st.date_input('Days (UTC)', value=date_range)
+        complete = _complete_range(picked)
+        
+        if st.button('Prepare export', disabled=not columns or not complete, use_container_width=True):
+            start_day, end_day = complete
+            # Streamed from the store in chunks into a temporary file rather than built in memory
+            source = get_shared_usage_store() if api_config.get('mode') == 'real' else df
+            with tempfile.TemporaryFile(buffering=0) as output:
+                with st.spinner("Exporting…"):
+                    rows = export_usage(source, output, export_format, level, start_day, end_day, columns, team=team)
+                file_format = EXPORT_FORMATS[export_format]
+                st.download_button(
+                    f"Download {rows:,} rows",
+                    data=output,
+                    file_name=f"cursor_usage_{team + '_' if team else ''}{level}_{start_day:%Y%m%d}_{end_day:%Y%m%d}"
+                              f"{file_format['extension']}",
+                    mime=file_format['mime'],
+                    use_container_width=True
+                )
+            st.caption("The download is available until the next interaction.")
 
 # Main app
 def main():
+    # Collect the spans of this run for the debug panel
+    trace = start_trace()
+    
+    # Page configuration; the module is imported once per process, so per-page setup belongs here
+    st.set_page_config(
+        page_title=DASHBOARD_CONFIG['title'],
+        page_icon="📊",
+        layout="wide",
+        initial_sidebar_state="expanded",
+        menu_items={
+            'Get Help': None,
+            'Report a bug': None,
+            'About': None
+        }
+    )
+    
+    # Load CSS styles; the stylesheet is read from disk once per process
+    load_css()
+    
     # Setup API configuration
     st.session_state.api_config = setup_api_config()
     
+    # The viewer's timezone only affects ranges and labels, so changing it never reloads data
+    tz = timezone_picker()
+    
     # Load data
-    df = load_data()
+    with span('load_data'):
+        df, rollups, notices, loaded_at, refreshing = load_data(st.session_state.api_config)
+    for notice in notices:
+        st.warning(notice)
+    
+    # Every team's rollup is built at load time, so switching teams never reloads data
+    team = team_picker(rollups)
+    rollup = rollups[team]
     
     # Header and date filter
     date_option = None
-    if 'date' in df.columns:
+    custom_range = None
+    if not rollup.empty:
         col1, col2, col3 = st.columns([3, 1, 1])
         
         with col1:
             create_header()
-        
-        with col2:
-            st.markdown("")  # Spacer
+            st.caption(f"Data as of {loaded_at.astimezone(tz):%d %b %Y %H:%M %Z}" + (" · refreshing…" if refreshing else ""))
         
         with col3:
             date_option = st.selectbox(
@@ -98,14 +460,29 @@ def main():
                 index=0,  # Default to '7D'
                 label_visibility="collapsed"
             )
+        
+        with col2:
+            if date_option == 'Custom':
+                custom_range = custom_range_picker(rollup, tz)
+            else:
+                st.markdown("")  # Spacer
     else:
         create_header()
     
-    # Apply date filtering using modular function
-    df = filter_data_by_date(df, date_option)
+    # Resolve the selected range; the rollup answers it without scanning daily rows
+    date_range = get_date_range(date_option, custom_range, tz)
     
     # Main dashboard content
-    show_dashboard(df)
+    team_rollups = {name: team_rollup for name, team_rollup in rollups.items() if name is not None}
+    show_dashboard(rollup, date_range, loaded_at, team, team_rollups if team is None else None)
+    
+    if not rollup.empty:
+        show_export_panel(st.session_state.api_config, df, date_range, team)
+    
+    if get_dev_config()['debug_mode'] or get_dev_config()['show_debug_info']:
+        show_debug_panel(st.session_state.api_config, trace)
+    
+    export_metrics()
         
 
 
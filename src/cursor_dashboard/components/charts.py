@@ -1,14 +1,18 @@
 import streamlit as st
-import plotly.express as px
 
-def create_lines_accepted_chart(chart_data):
-    """Create the lines accepted by developer chart"""
-    if chart_data.empty:
-        st.warning("No data available for chart.")
-        return
-    
-    # Sort data by Lines_Accepted in descending order for better visualization
-    sorted_data = chart_data.sort_values('Lines_Accepted', ascending=True)
+# Vertical space per bar, so large pages stay readable instead of squashing into 300px
+BAR_HEIGHT = 28
+MIN_CHART_HEIGHT = 300
+
+def build_lines_accepted_figure(chart_data):
+    """Build the lines accepted by developer bar chart figure"""
+    # Plotly Express is imported by each builder so it only loads once a chart is drawn, after the KPI cards
+    import plotly.express as px
+    # Rows arrive largest first with any "everyone else" bar last; plotly draws bottom-up
+    sorted_data = chart_data.iloc[::-1]
+    if 'Rank' in sorted_data.columns:
+        # Paged views label bars with their team-wide rank
+        sorted_data = sorted_data.assign(Developer=sorted_data['Rank'].astype(str) + '. ' + sorted_data['Developer'].astype(str))
     
     fig = px.bar(
         data_frame=sorted_data,
@@ -20,7 +24,7 @@ def create_lines_accepted_chart(chart_data):
     )
     
     fig.update_layout(
-        height=300,
+        height=max(MIN_CHART_HEIGHT, BAR_HEIGHT * len(sorted_data) + 80),
         xaxis_title="Lines Accepted",
         yaxis_title="Developer",
         font=dict(size=12),
@@ -35,10 +39,147 @@ def create_lines_accepted_chart(chart_data):
         showgrid=False,
         tickangle=0,
         tickfont=dict(size=11),
-        tickmode='array',
-        ticktext=sorted_data['Developer'].tolist(),
-        tickvals=list(range(len(sorted_data))),
         automargin=True
     )
+    return fig
+
+def build_trend_figure(trend_data, metric, color=None):
+    """Build a line chart of metric over Period, one line per color value"""
+    import plotly.express as px
+    fig = px.line(
+        data_frame=trend_data,
+        x='Period',
+        y=metric,
+        color=color,
+        markers=color is None,
+        color_discrete_sequence=None if color else ['#1f77b4']
+    )
+    
+    fig.update_layout(
+        height=MIN_CHART_HEIGHT + 60,
+        xaxis_title=None,
+        yaxis_title=metric,
+        font=dict(size=12),
+        plot_bgcolor='#f8f9fa',
+        paper_bgcolor='#f8f9fa',
+        margin=dict(l=20, r=20, t=30, b=20),
+        hovermode='x unified',
+        showlegend=color is not None
+    )
+    
+    fig.update_xaxes(showgrid=False)
+    fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='lightgray', rangemode='tozero')
+    return fig
+
+def build_feature_mix_figure(feature_mix):
+    """Build a donut chart of a developer's usage by feature"""
+    import plotly.express as px
+    fig = px.pie(
+        data_frame=feature_mix,
+        names='Feature',
+        values='Count',
+        hole=0.5
+    )
+    
+    fig.update_layout(
+        height=MIN_CHART_HEIGHT,
+        font=dict(size=12),
+        plot_bgcolor='#f8f9fa',
+        paper_bgcolor='#f8f9fa',
+        margin=dict(l=20, r=20, t=30, b=20)
+    )
+    return fig
+
+def build_funnel_figure(funnel):
+    """Build a bar chart of offered vs accepted suggestions per funnel step, labelled with the rate"""
+    import plotly.express as px
+    bars = funnel.melt(id_vars=['Step', 'Rate'], value_vars=['Offered', 'Accepted'], var_name='Stage', value_name='Count')
+    bars['Label'] = [f"{rate:.0f}%" if stage == 'Accepted' else '' for stage, rate in zip(bars['Stage'], bars['Rate'])]
+    fig = px.bar(
+        data_frame=bars,
+        x='Count',
+        y='Step',
+        color='Stage',
+        text='Label',
+        orientation='h',
+        barmode='group',
+        color_discrete_sequence=['#c7d7ea', '#1f77b4']
+    )
+    
+    fig.update_layout(
+        height=MIN_CHART_HEIGHT,
+        xaxis_title=None,
+        yaxis_title=None,
+        font=dict(size=12),
+        plot_bgcolor='#f8f9fa',
+        paper_bgcolor='#f8f9fa',
+        margin=dict(l=20, r=20, t=30, b=20),
+        legend_title_text=None
+    )
+    
+    fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='lightgray')
+    fig.update_yaxes(autorange='reversed')
+    return fig
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _cached_figure(cache_key, _build, _data, *args):
+    """Build a figure once per cache_key; the builder and frame are not hashed.
+    
+    Every create_*_chart function takes an optional cache_key, which must
+    identify everything the figure shows, e.g. (loaded_at, date_range, view,
+    page, search) for the lines accepted chart. Reruns with the same key reuse
+    the built figure; without a key the figure is built on every run.
+    """
+    return _build(_data, *args)
+
+def create_lines_accepted_chart(chart_data, cache_key=None):
+    """Create the lines accepted by developer chart"""
+    if chart_data.empty:
+        st.warning("No data available for chart.")
+        return
+    
+    if cache_key is None:
+        fig = build_lines_accepted_figure(chart_data)
+    else:
+        fig = _cached_figure(('lines_accepted',) + tuple(cache_key), build_lines_accepted_figure, chart_data)
+    
+    st.plotly_chart(fig, use_container_width=True)
+
+def create_trend_chart(trend_data, metric, color=None, cache_key=None):
+    """Create a usage trend line chart"""
+    if trend_data.empty:
+        st.warning("No data available for chart.")
+        return
+    
+    if cache_key is None:
+        fig = build_trend_figure(trend_data, metric, color)
+    else:
+        fig = _cached_figure(('trend', metric, color) + tuple(cache_key), build_trend_figure, trend_data, metric, color)
+    
+    st.plotly_chart(fig, use_container_width=True)
+
+def create_feature_mix_chart(feature_mix, cache_key=None):
+    """Create a developer's feature mix chart"""
+    if not feature_mix['Count'].any():
+        st.info("No feature usage in this range.")
+        return
+    
+    if cache_key is None:
+        fig = build_feature_mix_figure(feature_mix)
+    else:
+        fig = _cached_figure(('feature_mix',) + tuple(cache_key), build_feature_mix_figure, feature_mix)
+    
+    st.plotly_chart(fig, use_container_width=True)
+
+def create_funnel_chart(funnel, cache_key=None):
+    """Create a developer's acceptance funnel chart"""
+    if not funnel['Offered'].any():
+        st.info("No suggestions offered in this range.")
+        return
+    
+    if cache_key is None:
+        fig = build_funnel_figure(funnel)
+    else:
+        fig = _cached_figure(('funnel',) + tuple(cache_key), build_funnel_figure, funnel)
     
-    st.plotly_chart(fig, use_container_width=True) 
\ No newline at end of file
+    st.plotly_chart(fig, use_container_width=True)
@@ -1,4 +1,5 @@
 import streamlit as st
+from ..utils.kpi_registry import get_kpi_cards
 
 def create_kpi_card(title, value, description, gradient_colors, icon):
     """Create a KPI card with consistent styling"""
@@ -22,51 +23,13 @@ def create_kpi_card(title, value, description, gradient_colors, icon):
     </div>
     """
 
-def display_kpi_cards(total_developers, active_developers, avg_lines_per_dev, acceptance_ratio):
-    """Display all KPI cards in a 4-column layout"""
-    col1, col2, col3, col4 = st.columns(4)
-    
-    # KPI card configurations
-    kpi_configs = [
-        {
-            'title': 'Total Developers',
-            'value': total_developers,
-            'description': 'Unique developers',
-            'gradient_colors': '#667eea 0%, #764ba2 100%',
-            'icon': '👥'
-        },
-        {
-            'title': 'Active Developers',
-            'value': active_developers,
-            'description': 'With any activity',
-            'gradient_colors': '#f093fb 0%, #f5576c 100%',
-            'icon': '🚀'
-        },
-        {
-            'title': 'Avg Lines/Dev',
-            'value': f"{avg_lines_per_dev:.0f}",
-            'description': 'Per active developer',
-            'gradient_colors': '#4facfe 0%, #00f2fe 100%',
-            'icon': '📊'
-        },
-        {
-            'title': 'Acceptance Ratio',
-            'value': f"{acceptance_ratio:.1f}%",
-            'description': 'Accepted/Suggested',
-            'gradient_colors': '#43e97b 0%, #38f9d7 100%',
-            'icon': '✅'
-        }
-    ]
+def display_kpi_cards(kpis, cards_per_row=4):
+    """Display a card for every registered KPI, wrapping into rows of cards_per_row"""
+    kpi_configs = get_kpi_cards(kpis)
     
     # Display KPI cards
-    with col1:
-        st.markdown(create_kpi_card(**kpi_configs[0]), unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown(create_kpi_card(**kpi_configs[1]), unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown(create_kpi_card(**kpi_configs[2]), unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown(create_kpi_card(**kpi_configs[3]), unsafe_allow_html=True) 
\ No newline at end of file
+    for row_start in range(0, len(kpi_configs), cards_per_row):
+        columns = st.columns(cards_per_row)
+        for column, kpi_config in zip(columns, kpi_configs[row_start:row_start + cards_per_row]):
+            with column:
+                st.markdown(create_kpi_card(**kpi_config), unsafe_allow_html=True)
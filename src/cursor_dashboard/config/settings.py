@@ -1,26 +1,87 @@
+import functools
+import hashlib
 import os
 from datetime import datetime, timedelta
+from pathlib import Path
 import json
 from dotenv import load_dotenv
 import pytz
 
-# Load environment variables from .env file
-load_dotenv('.env')
+# Project root, holding .env next to run.py
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+# Load environment variables from the project's .env file, wherever the dashboard is launched from
+load_dotenv(PROJECT_ROOT / '.env')
+
+def _project_path(value):
+    """Resolve a relative path against the project root, so processes started from any directory share it"""
+    return str(PROJECT_ROOT / os.path.expanduser(value)) if value else value
 
 # Dashboard Configuration
 DASHBOARD_CONFIG = {
     'title': os.getenv('DASHBOARD_TITLE', "Arcadea Group - Cursor Analytics"),
     'description': os.getenv('DASHBOARD_DESCRIPTION', f'Interactive dashboard to track Cursor IDE usage patterns and productivity metrics for {os.getenv("COMPANY_NAME", "Arcadea Group")}'),
     'version': '1.0.0',
-    'author': 'AI Team'
+    'author': 'AI Team',
+    # Developers drawn individually before the rest are grouped into one bar
+    'chart_top_n': int(os.getenv('CHART_TOP_N', 20)),
+    'chart_page_size': int(os.getenv('CHART_PAGE_SIZE', 25)),
+    # Points kept per developer trend line after downsampling
+    'trend_max_points': int(os.getenv('TREND_MAX_POINTS', 120)),
+    'trend_default_developers': int(os.getenv('TREND_DEFAULT_DEVELOPERS', 5))
 }
 
 # API Configuration
 API_CONFIG = {
     'base_url': os.getenv('API_BASE_URL', ''),
     'api_key': os.getenv('API_KEY', ''),
+    # Name stored with the usage of the single API_KEY team
+    'team_name': os.getenv('API_TEAM_NAME', 'default'),
+    # JSON list of teams, e.g. [{"name": "Platform", "api_key": "..."}]; replaces API_KEY when set
+    'teams': os.getenv('API_TEAMS', ''),
+    # Requests per second allowed per team, 0 for no limit; teams may override it with "rate_limit"
+    'rate_limit': float(os.getenv('API_RATE_LIMIT', 0)),
+    # Teams fetched at the same time
+    'team_workers': int(os.getenv('API_TEAM_WORKERS', 4)),
     'timeout': int(os.getenv('API_TIMEOUT', 30)),
-    'headers': json.loads(os.getenv('API_HEADERS', '{"Content-Type": "application/json"}'))
+    'headers': json.loads(os.getenv('API_HEADERS', '{"Content-Type": "application/json"}')),
+    'history_days': int(os.getenv('API_HISTORY_DAYS', 365)),
+    'backfill_window_days': int(os.getenv('API_BACKFILL_WINDOW_DAYS', 30)),
+    'max_workers': int(os.getenv('API_MAX_WORKERS', 4)),
+    'max_retries': int(os.getenv('API_MAX_RETRIES', 5)),
+    'backoff_factor': float(os.getenv('API_BACKOFF_FACTOR', 1.0)),
+    # Longest Retry-After wait honoured, in seconds; longer server requests are cut to this
+    'max_retry_after': float(os.getenv('API_MAX_RETRY_AFTER', 60)),
+    'checkpoint_dir': _project_path(os.getenv('API_CHECKPOINT_DIR', '.cursor_dashboard/backfill')),
+    'stream_batch_size': int(os.getenv('API_STREAM_BATCH_SIZE', 5000))
+}
+
+# Local usage store configuration
+STORAGE_CONFIG = {
+    # 'sqlite' (local file) or 'mongo' (KPIs and charts aggregated server-side)
+    'backend': os.getenv('USAGE_STORE_BACKEND', 'sqlite').lower(),
+    'path': _project_path(os.getenv('USAGE_STORE_PATH', '.cursor_dashboard/usage.sqlite3')),
+    'mongo_uri': os.getenv('MONGO_URI', 'mongodb://localhost:27017'),
+    'mongo_database': os.getenv('MONGO_DATABASE', 'cursor_dashboard'),
+    # When false the dashboard only reads the store and ingestion runs via `python -m cursor_dashboard.ingest`
+    'sync_on_load': os.getenv('DASHBOARD_SYNC_ON_LOAD', 'true').lower() == 'true'
+}
+
+# Dashboard data cache configuration
+CACHE_CONFIG = {
+    'ttl_seconds': int(os.getenv('DATA_CACHE_TTL', 900))
+}
+
+# Pipeline metrics export
+METRICS_CONFIG = {
+    # Prometheus text file (e.g. for node_exporter's textfile collector); empty disables it
+    'prometheus_file': os.getenv('METRICS_PROMETHEUS_FILE', '')
+}
+
+# Bulk usage exports
+EXPORT_CONFIG = {
+    # Rows read, aggregated and written per chunk (one Parquet row group per chunk)
+    'chunk_rows': int(os.getenv('EXPORT_CHUNK_ROWS', 50000))
 }
 
 # Development settings
@@ -28,7 +89,11 @@ DEV_CONFIG = {
     'debug_mode': os.getenv('DEBUG_MODE', 'false').lower() == 'true',
     'enable_mock_data': os.getenv('ENABLE_MOCK_DATA', 'false').lower() == 'true',
     'auto_refresh_data': os.getenv('AUTO_REFRESH_DATA', 'true').lower() == 'true',
-    'show_debug_info': os.getenv('SHOW_DEBUG_INFO', 'false').lower() == 'true'
+    'show_debug_info': os.getenv('SHOW_DEBUG_INFO', 'false').lower() == 'true',
+    'mock_developers': int(os.getenv('MOCK_DEVELOPERS', 50)),
+    # Mock developers are split across this many teams
+    'mock_teams': int(os.getenv('MOCK_TEAMS', 1)),
+    'mock_seed': int(os.getenv('MOCK_SEED', 42))
 }
 
 # Timezone Configuration
@@ -36,20 +101,90 @@ TIMEZONE_CONFIG = {
     'default_timezone': os.getenv('DEFAULT_TIMEZONE', 'Asia/Colombo')
 }
 
-def get_timezone():
-    """Get the configured timezone object"""
-    timezone_name = TIMEZONE_CONFIG['default_timezone']
+@functools.lru_cache(maxsize=None)
+def _load_timezone(timezone_name):
     return pytz.timezone(timezone_name)
 
-def get_current_datetime():
-    """Get current datetime in configured timezone"""
-    tz = get_timezone()
-    return datetime.now(tz)
+def get_timezone(timezone_name=None):
+    """Get a timezone object, the configured default unless a name is given; built once per name"""
+    return _load_timezone(timezone_name or TIMEZONE_CONFIG['default_timezone'])
+
+def get_timezone_names():
+    """Get the timezone names viewers can pick from"""
+    return pytz.common_timezones
+
+def get_current_datetime(tz=None):
+    """Get current datetime in tz, or the configured timezone"""
+    return datetime.now(tz or get_timezone())
 
 def get_api_config():
     """Get API configuration"""
     return API_CONFIG
 
+def get_team_key(base_url: str, api_key: str) -> str:
+    """Get a stable, non-secret identifier for a team's API credentials"""
+    return hashlib.sha256(f"{base_url}|{api_key}".encode()).hexdigest()[:16]
+
+@functools.lru_cache(maxsize=None)
+def get_team_configs():
+    """Get the configured teams as dicts with name, base_url, api_key and rate_limit; parsed once per process"""
+    api_config = get_api_config()
+    if api_config['teams']:
+        try:
+            teams = json.loads(api_config['teams'])
+        except json.JSONDecodeError as e:
+            raise ValueError(f"API_TEAMS is not valid JSON: {e}")
+        if not isinstance(teams, list) or not all(isinstance(team, dict) and team.get('name') and team.get('api_key') for team in teams):
+            raise ValueError('API_TEAMS must be a JSON list of objects with "name" and "api_key"')
+        names = [team['name'] for team in teams]
+        if len(set(names)) != len(names):
+            raise ValueError("API_TEAMS has duplicate team names")
+    elif api_config['api_key']:
+        teams = [{'name': api_config['team_name'], 'api_key': api_config['api_key']}]
+    else:
+        return []
+    return [
+        {
+            'name': team['name'],
+            'base_url': team.get('base_url') or api_config['base_url'],
+            'api_key': team['api_key'],
+            'rate_limit': float(team.get('rate_limit', api_config['rate_limit']))
+        }
+        for team in teams
+    ]
+
+def setup_api_config():
+    """Setup API configuration using environment variables"""
+    teams = [team for team in get_team_configs() if team['base_url']]
+    
+    # Check if real API is configured
+    if teams:
+        return {
+            'mode': 'real',
+            'teams': teams
+        }
+    else:
+        return {
+            'mode': 'mock',
+            'teams': []
+        }
+
+def get_storage_config():
+    """Get local usage store configuration"""
+    return STORAGE_CONFIG
+
+def get_cache_config():
+    """Get dashboard data cache configuration"""
+    return CACHE_CONFIG
+
+def get_metrics_config():
+    """Get pipeline metrics export configuration"""
+    return METRICS_CONFIG
+
+def get_export_config():
+    """Get bulk usage export configuration"""
+    return EXPORT_CONFIG
+
 def get_company_settings():
     """Get company settings"""
     return COMPANY_SETTINGS
@@ -0,0 +1,83 @@
+"""
+Command line entry point for bulk usage exports.
+
+Usage:
+    python -m cursor_dashboard.export --since 2025-01-01 --until 2025-12-31 --output usage.csv
+    python -m cursor_dashboard.export --level month --format parquet --output usage_monthly.parquet
+    python -m cursor_dashboard.export --columns acceptedLinesAdded,chatRequests --format jsonl > usage.jsonl
+"""
+import argparse
+import logging
+import sys
+from datetime import date
+from ..storage.usage_store import UsageStore, get_usage_store
+from ..utils.metrics import export_metrics
+from .core import EXPORT_FORMATS, EXPORT_LEVELS, export_usage, parquet_available, validate_columns
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cursor_dashboard.export',
+        description='Export stored usage per developer and day, week or month.'
+    )
+    parser.add_argument('--since', type=date.fromisoformat, help='First UTC day to export (YYYY-MM-DD)')
+    parser.add_argument('--until', type=date.fromisoformat, help='Last UTC day to export (YYYY-MM-DD)')
+    parser.add_argument('--level', choices=list(EXPORT_LEVELS), default='day',
+                        help='Export daily rows or per-developer weekly or monthly rollups')
+    parser.add_argument('--format', dest='export_format', choices=list(EXPORT_FORMATS), default='csv',
+                        help='Output format; parquet requires pyarrow')
+    parser.add_argument('--columns', type=lambda value: [col.strip() for col in value.split(',') if col.strip()],
+                        help='Comma-separated usage counters to include, default all')
+    parser.add_argument('--output', default='-', help='Output file, default stdout (csv and jsonl only)')
+    parser.add_argument('--chunk-rows', type=int, help='Rows per chunk, default EXPORT_CHUNK_ROWS')
+    parser.add_argument('--team', help='Only export this team, default all teams')
+    parser.add_argument('--store', help='Usage store path, default USAGE_STORE_PATH')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Enable debug logging')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(asctime)s %(levelname)s %(name)s: %(message)s',
+        stream=sys.stderr
+    )
+    logger = logging.getLogger(__name__)
+    if args.since and args.until and args.since > args.until:
+        logger.error("--since (%s) must not be after --until (%s)", args.since, args.until)
+        return 2
+    if args.output == '-' and args.export_format == 'parquet':
+        logger.error("Parquet exports need an --output file")
+        return 2
+    
+    store = UsageStore(args.store) if args.store else get_usage_store()
+    export_kwargs = {
+        'export_format': args.export_format,
+        'level': args.level,
+        'start_day': args.since,
+        'end_day': args.until,
+        'columns': args.columns,
+        'chunk_rows': args.chunk_rows,
+        'team': args.team
+    }
+    try:
+        # Checked before the output file is created
+        validate_columns(args.columns)
+        if args.export_format == 'parquet' and not parquet_available():
+            raise ValueError("Parquet export requires pyarrow: pip install pyarrow")
+        if args.output == '-':
+            export_usage(store, sys.stdout.buffer, **export_kwargs)
+            sys.stdout.buffer.flush()
+        else:
+            with open(args.output, 'wb') as output:
+                export_usage(store, output, **export_kwargs)
+        export_metrics()
+    except BrokenPipeError:
+        # Output piped into e.g. head, which stopped reading
+        return 1
+    except ValueError as e:
+        logger.error("%s", e)
+        return 2
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
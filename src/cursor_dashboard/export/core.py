@@ -0,0 +1,168 @@
+import logging
+from datetime import date
+from typing import BinaryIO, Iterable, Iterator, List
+import pandas as pd
+from ..config.settings import get_export_config
+from ..utils.data_processing import USAGE_COUNTER_COLUMNS
+from ..utils.dates import day_range_ms, epoch_ms_to_days
+from ..utils.metrics import span
+from ..utils.rollups import period_start
+
+logger = logging.getLogger(__name__)
+
+# Export format -> file extension and MIME type
+EXPORT_FORMATS = {
+    'csv': {'extension': '.csv', 'mime': 'text/csv'},
+    'jsonl': {'extension': '.jsonl', 'mime': 'application/x-ndjson'},
+    'parquet': {'extension': '.parquet', 'mime': 'application/vnd.apache.parquet'},
+}
+
+# Export level -> name of the column holding the day or period start
+EXPORT_LEVELS = {'day': 'date', 'week': 'week_start', 'month': 'month_start'}
+
+# Columns identifying the developer on every exported row
+IDENTITY_COLUMNS = ['team', 'user', 'email']
+
+def parquet_available() -> bool:
+    """Check whether the optional pyarrow dependency for Parquet export is installed"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def validate_columns(columns: List[str] = None) -> List[str]:
+    """Return the counter columns to export, all of them by default"""
+    if not columns:
+        return list(USAGE_COUNTER_COLUMNS)
+    unknown = [col for col in columns if col not in USAGE_COUNTER_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown export columns: {', '.join(unknown)}")
+    return list(columns)
+
+def iter_usage_chunks(source, start_day: date = None, end_day: date = None, columns: List[str] = None,
+                      chunk_rows: int = None, team: str = None) -> Iterator[pd.DataFrame]:
+    """Yield daily rows in [start_day, end_day] ordered by team, developer and day, from a usage store or frame"""
+    chunk_rows = chunk_rows or get_export_config()['chunk_rows']
+    if hasattr(source, 'iter_frames'):
+        yield from source.iter_frames(start_day, end_day, columns, chunk_rows, team=team)
+        return
+
+    # An in-memory usage frame, e.g. mock data; filtered before it is sorted and sliced
+    df = source
+    if df.empty:
+        return
+    if team is not None:
+        df = df[df['team'] == team]
+    if start_day or end_day:
+        start_ms, end_ms = day_range_ms(start_day or date.min, end_day or date.max)
+        df = df[(df['date'] >= start_ms) & (df['date'] < end_ms)]
+    df = df[IDENTITY_COLUMNS + ['date'] + list(columns or USAGE_COUNTER_COLUMNS)].sort_values(
+        ['team', 'email', 'date'], kind='stable')
+    for offset in range(0, len(df), chunk_rows):
+        yield df.iloc[offset:offset + chunk_rows]
+
+def _normalize(chunk: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """Give every chunk the same plain dtypes so writers see one schema"""
+    return pd.DataFrame({
+        'team': chunk['team'].astype(str).to_numpy(),
+        'user': chunk['user'].astype(str).to_numpy(),
+        'email': chunk['email'].astype(str).to_numpy(),
+        'day': epoch_ms_to_days(chunk['date']).to_numpy(),
+        **{col: chunk[col].fillna(0).astype('int64').to_numpy() for col in columns}
+    })
+
+def _aggregate(rows: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    sums = rows.groupby(['team', 'email', 'period'], sort=False).agg({'user': 'first', **{col: 'sum' for col in columns}})
+    return sums.reset_index().rename(columns={'period': 'day'})
+
+def _export_frame(rows: pd.DataFrame, level: str, columns: List[str]) -> pd.DataFrame:
+    period_column = EXPORT_LEVELS[level]
+    return rows.rename(columns={'day': period_column})[IDENTITY_COLUMNS + [period_column] + columns]
+
+def iter_export_chunks(source, level: str = 'day', start_day: date = None, end_day: date = None,
+                       columns: List[str] = None, chunk_rows: int = None, team: str = None) -> Iterator[pd.DataFrame]:
+    """Yield export rows per developer and day, week or month, filtered and projected before serialization"""
+    if level not in EXPORT_LEVELS:
+        raise ValueError(f"Unknown export level '{level}', expected one of: {', '.join(EXPORT_LEVELS)}")
+    columns = validate_columns(columns)
+    carry = None
+    exported = False
+    for chunk in iter_usage_chunks(source, start_day, end_day, columns, chunk_rows, team):
+        if chunk.empty:
+            continue
+        rows = _normalize(chunk, columns)
+        if level == 'day':
+            exported = True
+            yield _export_frame(rows, level, columns)
+            continue
+        
+        rows['period'] = period_start(rows.pop('day'), level)
+        if carry is not None:
+            rows = pd.concat([carry, rows], ignore_index=True)
+        # Rows arrive ordered by team, developer and day, so only the last developer-period can continue in the next chunk
+        last = ((rows['team'] == rows['team'].iloc[-1]) & (rows['email'] == rows['email'].iloc[-1]) &
+                (rows['period'] == rows['period'].iloc[-1]))
+        carry = rows[last]
+        if (~last).any():
+            exported = True
+            yield _export_frame(_aggregate(rows[~last], columns), level, columns)
+    if carry is not None:
+        yield _export_frame(_aggregate(carry, columns), level, columns)
+    elif not exported:
+        # Nothing in range: still yield the typed, empty frame so writers emit a header or schema
+        yield _export_frame(_normalize(pd.DataFrame(columns=IDENTITY_COLUMNS + ['date'] + columns), columns), level, columns)
+
+def _text_chunk(chunk: pd.DataFrame, export_format: str, header: bool) -> bytes:
+    # Days are written as plain YYYY-MM-DD dates
+    period_column = chunk.columns[len(IDENTITY_COLUMNS)]
+    chunk = chunk.assign(**{period_column: chunk[period_column].dt.strftime('%Y-%m-%d')})
+    if export_format == 'csv':
+        return chunk.to_csv(index=False, header=header).encode('utf-8')
+    if chunk.empty:
+        return b''
+    return (chunk.to_json(orient='records', lines=True, force_ascii=False).rstrip('\n') + '\n').encode('utf-8')
+
+def write_export(chunks: Iterable[pd.DataFrame], export_format: str, output: BinaryIO) -> int:
+    """Write export chunks to a binary stream as they arrive, one Parquet row group per chunk.
+
+    Returns the number of rows written.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{export_format}', expected one of: {', '.join(EXPORT_FORMATS)}")
+    if export_format == 'parquet' and not parquet_available():
+        raise ValueError("Parquet export requires pyarrow: pip install pyarrow")
+    
+    if export_format == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    
+    written = 0
+    writer = None
+    with span('export') as export_span:
+        try:
+            for chunk in chunks:
+                if export_format == 'parquet':
+                    period_column = chunk.columns[len(IDENTITY_COLUMNS)]
+                    table = pa.Table.from_pandas(
+                        chunk.assign(**{period_column: chunk[period_column].dt.date}), preserve_index=False
+                    )
+                    writer = writer or pq.ParquetWriter(output, table.schema)
+                    writer.write_table(table)
+                else:
+                    # Only the first CSV chunk carries the header
+                    output.write(_text_chunk(chunk, export_format, header=not written))
+                written += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        export_span['rows'] = written
+    logger.info("Exported %s rows as %s", written, export_format)
+    return written
+
+def export_usage(source, output: BinaryIO, export_format: str = 'csv', level: str = 'day',
+                 start_day: date = None, end_day: date = None, columns: List[str] = None,
+                 chunk_rows: int = None, team: str = None) -> int:
+    """Stream usage of one team or all teams from a store or frame to output, returning rows written"""
+    chunks = iter_export_chunks(source, level, start_day, end_day, columns, chunk_rows, team)
+    return write_export(chunks, export_format, output)
@@ -0,0 +1,6 @@
+"""
+Headless ingestion of Cursor Admin API usage into the local store.
+
+Nothing in this package imports Streamlit, so it can run from cron or as a
+long-running scheduler while the dashboard only reads the store.
+"""
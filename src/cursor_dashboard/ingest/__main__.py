@@ -0,0 +1,64 @@
+"""
+Command line entry point for headless ingestion.
+
+Usage:
+    python -m cursor_dashboard.ingest --since 2025-01-01 --until 2025-06-30
+    python -m cursor_dashboard.ingest --every 3600
+    python -m cursor_dashboard.ingest --team Platform --team Mobile
+"""
+import argparse
+import logging
+import sys
+from datetime import date
+from ..storage.usage_store import UsageStore
+from ..utils.metrics import export_metrics
+from .core import ingest, run_scheduler
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cursor_dashboard.ingest',
+        description='Fetch Cursor Admin API usage into the local usage store.'
+    )
+    parser.add_argument('--since', type=date.fromisoformat, help='First day to ingest (YYYY-MM-DD)')
+    parser.add_argument('--until', type=date.fromisoformat, help='Last day to ingest (YYYY-MM-DD), default today')
+    parser.add_argument('--force', action='store_true', help='Re-fetch days that are already stored')
+    parser.add_argument('--team', action='append', dest='teams', metavar='NAME',
+                        help='Only ingest this API_TEAMS team; repeat for several, default all')
+    parser.add_argument('--store', help='Usage store path, default USAGE_STORE_PATH')
+    parser.add_argument('--every', type=float, metavar='SECONDS',
+                        help='Keep running and ingest every SECONDS instead of once')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Enable debug logging')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(asctime)s %(levelname)s %(name)s: %(message)s'
+    )
+    ingest_kwargs = {
+        'since': args.since,
+        'until': args.until,
+        'force': args.force,
+        'teams': args.teams,
+        'store': UsageStore(args.store) if args.store else None
+    }
+    try:
+        if args.every:
+            run_scheduler(args.every, **ingest_kwargs)
+        else:
+            ingest(**ingest_kwargs)
+            export_metrics()
+    except KeyboardInterrupt:
+        return 130
+    except ValueError as e:
+        logging.getLogger(__name__).error("%s", e)
+        return 2
+    except RuntimeError:
+        # Raised after every team has run; the failing teams were already logged
+        export_metrics()
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import Dict, List
+from ..api.integration import CursorAPIFetcher
+from ..config.settings import get_api_config, setup_api_config
+from ..utils.dates import utc_today
+from ..utils.metrics import export_metrics, increment, span
+from ..storage.usage_store import UsageStore, get_days_to_sync, get_usage_store, sync_days
+
+logger = logging.getLogger(__name__)
+
+def ingest(since: date = None, until: date = None, force: bool = False, config: Dict = None,
+           store: UsageStore = None, fetchers: Dict[str, CursorAPIFetcher] = None, teams: List[str] = None) -> int:
+    """Fetch missing (or, with force, all) days in [since, until] for every team into the store.
+
+    Days are UTC days; since defaults to API_HISTORY_DAYS ago and until to
+    today. Teams are fetched concurrently, up to API_TEAM_WORKERS at a time,
+    each under its own rate limit, so a run takes about as long as the slowest
+    team. Pass shared fetchers by team name to reuse their connection pools and
+    teams to ingest only some of them. Returns the number of rows written.
+    """
+    config = config or setup_api_config()
+    if config['mode'] != 'real':
+        raise ValueError("API_BASE_URL and API_KEY (or API_TEAMS) must be configured to ingest usage data")
+    team_configs = [team for team in config['teams'] if not teams or team['name'] in teams]
+    if teams and len(team_configs) != len(set(teams)):
+        unknown = sorted(set(teams) - {team['name'] for team in team_configs})
+        raise ValueError(f"Unknown team(s): {', '.join(unknown)}")
+    
+    today = utc_today()
+    until = until or today
+    since = since or today - timedelta(days=get_api_config()['history_days'])
+    if since > until:
+        raise ValueError(f"--since ({since}) must not be after --until ({until})")
+    
+    store = store or get_usage_store()
+    fetchers = fetchers or {}
+    
+    def ingest_team(team: Dict) -> int:
+        fetcher = fetchers.get(team['name']) or CursorAPIFetcher(
+            team['base_url'], team['api_key'], team['name'], team['rate_limit']
+        )
+        days = get_days_to_sync(store, since, until, force=force, team=team['name'])
+        started = time.perf_counter()
+        with span(f"ingest:{team['name']}") as team_span:
+            written = team_span['rows'] = sync_days(fetcher, store, days, force=force)
+        logger.info("Ingested %s rows for team %s, %s day(s) between %s and %s in %.1fs",
+                    written, team['name'], len(days), since, until, time.perf_counter() - started)
+        return written
+    
+    written = 0
+    failures = {}
+    workers = max(1, min(get_api_config()['team_workers'], len(team_configs)))
+    with span('ingest') as ingest_span, ThreadPoolExecutor(max_workers=workers) as executor:
+        # Each team runs in a copy of this context so its span lands in the caller's trace
+        futures = {
+            executor.submit(contextvars.copy_context().run, ingest_team, team): team['name']
+            for team in team_configs
+        }
+        for future in as_completed(futures):
+            try:
+                written += future.result()
+            except Exception as e:
+                # Other teams keep going; their rows are stored even if one team fails
+                logger.error("Ingestion failed for team %s: %s", futures[future], e)
+                failures[futures[future]] = e
+        ingest_span['rows'] = written
+    if failures:
+        raise RuntimeError("; ".join(f"{team}: {error}" for team, error in sorted(failures.items())))
+    return written
+
+def run_scheduler(interval_seconds: float, **ingest_kwargs):
+    """Run ingest() every interval_seconds until interrupted"""
+    logger.info("Starting ingestion scheduler, every %ss", interval_seconds)
+    while True:
+        started = time.monotonic()
+        try:
+            ingest(**ingest_kwargs)
+        except Exception:
+            # Keep the loop alive; the next run picks up the same missing days
+            logger.exception("Ingestion run failed")
+            increment('ingest_failures_total', help_text='Scheduled ingestion runs that failed')
+        export_metrics()
+        time.sleep(max(interval_seconds - (time.monotonic() - started), 0))
@@ -0,0 +1,288 @@
+import copy
+import functools
+import threading
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import pandas as pd
+from pymongo import ASCENDING, DESCENDING, MongoClient, UpdateOne
+from ..config.settings import get_api_config, get_current_datetime, get_storage_config
+from ..utils.data_cache import LRUCache
+from ..utils.data_processing import USAGE_COUNTER_COLUMNS
+from ..utils.dates import to_epoch_ms
+from ..utils.kpi_registry import ACTIVITY_COLUMNS, get_registered_columns
+
+# Documents sent per bulk_write call
+BULK_BATCH_SIZE = 1000
+
+# Query results a snapshot keeps, e.g. one per range, team and query
+SNAPSHOT_CACHE_SIZE = 256
+
+# (client, database) pairs already migrated and indexed by this process
+_prepared = set()
+_prepared_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=None)
+def _shared_client(uri: str) -> MongoClient:
+    """Get the process-wide client for a URI; MongoClient is thread-safe and pools its connections"""
+    return MongoClient(uri)
+
+def _hashable(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+def _snapshot_cached(query):
+    """Serve a query from a snapshot's results, keyed on the query, the view's team and the arguments"""
+    @functools.wraps(query)
+    def cached_query(self, *args, **kwargs):
+        if self._results is None:
+            return query(self, *args, **kwargs)
+        key = (query.__name__, self.team, _hashable(args), _hashable(sorted(kwargs.items())))
+        return self._results.get(key, lambda: query(self, *args, **kwargs))
+    return cached_query
+
+class MongoUsageStore:
+    """MongoDB usage store keyed by (team, email, day) with aggregation-pipeline pushdown.
+
+    Implements the same sync interface as UsageStore, plus totals(),
+    kpi_totals(), developer_totals() and developer_daily() so the dashboard
+    receives per-developer or single-row results instead of every daily row.
+    for_team() returns a view whose queries only match one team, and
+    snapshot() a view that caches query results for one data load.
+    """
+    
+    def __init__(self, uri: str = None, database: str = None, client: MongoClient = None):
+        storage_config = get_storage_config()
+        self.client = client or _shared_client(uri or storage_config['mongo_uri'])
+        self.db = self.client[database or storage_config['mongo_database']]
+        self.usage = self.db['usage']
+        self.synced_days = self.db['synced_days']
+        self.team = None
+        self._results = None
+        with _prepared_lock:
+            if (id(self.client), self.db.name) not in _prepared:
+                self._migrate_legacy_documents()
+                self._create_indexes()
+                _prepared.add((id(self.client), self.db.name))
+
+    def for_team(self, team: str) -> 'MongoUsageStore':
+        """A view of the store limited to one team's usage"""
+        view = copy.copy(self)
+        view.team = team
+        return view
+
+    def snapshot(self) -> 'MongoUsageStore':
+        """A view that runs each query once and then serves its cached result; take a new one after writes"""
+        view = copy.copy(self)
+        view._results = LRUCache(SNAPSHOT_CACHE_SIZE)
+        return view
+
+    def _migrate_legacy_documents(self):
+        """Assign documents written before teams existed to the single API_KEY team"""
+        legacy_team = get_api_config()['team_name']
+        if 'email_1_day_1' in self.usage.index_information():
+            self.usage.drop_index('email_1_day_1')
+        self.usage.update_many({'team': {'$exists': False}}, {'$set': {'team': legacy_team}})
+        for document in list(self.synced_days.find({'team': {'$exists': False}})):
+            day = document['_id']
+            self.synced_days.replace_one(
+                {'_id': f'{legacy_team}|{day}'},
+                {'team': legacy_team, 'day': day, 'synced_at': document['synced_at']},
+                upsert=True
+            )
+            self.synced_days.delete_one({'_id': day})
+
+    def _create_indexes(self):
+        self.usage.create_index([('team', ASCENDING), ('email', ASCENDING), ('day', ASCENDING)], unique=True)
+        # Range queries match on day first, then group by developer
+        self.usage.create_index([('day', ASCENDING), ('email', ASCENDING)])
+        # Developer drill-downs match one developer, then a day range
+        self.usage.create_index([('user', ASCENDING), ('day', ASCENDING)])
+
+    def upsert_frame(self, df: pd.DataFrame) -> int:
+        """Bulk-upsert rows from a converted usage DataFrame, returning the number written"""
+        if df.empty:
+            return 0
+        # BSON dates are UTC, like the stored epoch milliseconds
+        dates = pd.to_datetime(df['date'].to_numpy(dtype='int64'), unit='ms')
+        team = df['team'].astype(str) if 'team' in df.columns else get_api_config()['team_name']
+        documents = pd.DataFrame({
+            'team': team,
+            'email': df['email'].astype(str),
+            'day': dates.strftime('%Y-%m-%d'),
+            'user': df['user'].astype(str),
+            'date': dates,
+            **{col: df[col].astype('int64') for col in USAGE_COUNTER_COLUMNS}
+        }).to_dict('records')
+        operations = [
+            UpdateOne({'team': document['team'], 'email': document['email'], 'day': document['day']},
+                      {'$set': document}, upsert=True)
+            for document in documents
+        ]
+        for start in range(0, len(operations), BULK_BATCH_SIZE):
+            self.usage.bulk_write(operations[start:start + BULK_BATCH_SIZE], ordered=False)
+        return len(operations)
+
+    def mark_days_synced(self, days: Iterable[date], team: str = None):
+        """Record days as fetched from the API for a team"""
+        team = team or get_api_config()['team_name']
+        synced_at = get_current_datetime().isoformat()
+        operations = [
+            UpdateOne({'_id': f'{team}|{day.isoformat()}'},
+                      {'$set': {'team': team, 'day': day.isoformat(), 'synced_at': synced_at}}, upsert=True)
+            for day in days
+        ]
+        if operations:
+            self.synced_days.bulk_write(operations, ordered=False)
+
+    def get_synced_days(self, team: str = None) -> Set[date]:
+        """Get the set of days that have already been fetched for a team"""
+        team = team or get_api_config()['team_name']
+        return {date.fromisoformat(document['day']) for document in self.synced_days.find({'team': team}, {'day': 1})}
+
+    @_snapshot_cached
+    def teams(self) -> List[str]:
+        """Get the names of the teams with stored usage"""
+        return sorted(self.usage.distinct('team'))
+
+    def load(self, start_day: date = None, end_day: date = None, team: str = None) -> pd.DataFrame:
+        """Read stored rows, optionally limited to an inclusive day range and one team"""
+        columns = ['team', 'user', 'email', 'date'] + USAGE_COUNTER_COLUMNS
+        match = self._day_match(start_day, end_day, team)
+        cursor = self.usage.find(match, {'_id': 0, **{col: 1 for col in columns}})
+        return _usage_frame(list(cursor.sort([('day', ASCENDING), ('team', ASCENDING), ('email', ASCENDING)])), columns)
+
+    def iter_frames(self, start_day: date = None, end_day: date = None, columns: List[str] = None,
+                    chunk_rows: int = 50_000, team: str = None) -> Iterator[pd.DataFrame]:
+        """Yield stored rows ordered by team, developer and day, at most chunk_rows at a time"""
+        columns = ['team', 'user', 'email', 'date'] + [col for col in (columns or USAGE_COUNTER_COLUMNS) if col in USAGE_COUNTER_COLUMNS]
+        cursor = self.usage.find(self._day_match(start_day, end_day, team), {'_id': 0, **{col: 1 for col in columns}})
+        # Follows the unique (team, email, day) index; documents arrive in server batches of chunk_rows
+        cursor = cursor.sort([('team', ASCENDING), ('email', ASCENDING), ('day', ASCENDING)]).batch_size(chunk_rows)
+        batch = []
+        for document in cursor:
+            batch.append(document)
+            if len(batch) == chunk_rows:
+                yield _usage_frame(batch, columns)
+                batch = []
+        if batch:
+            yield _usage_frame(batch, columns)
+
+    @property
+    @_snapshot_cached
+    def empty(self) -> bool:
+        if self.team is None:
+            return self.usage.estimated_document_count() == 0
+        return self.usage.find_one(self._day_match(), {'_id': 1}) is None
+
+    @_snapshot_cached
+    def date_bounds(self) -> Tuple[Optional[date], Optional[date]]:
+        """Get the first and last stored day"""
+        first = self.usage.find_one(self._day_match(), {'day': 1}, sort=[('day', ASCENDING)])
+        last = self.usage.find_one(self._day_match(), {'day': 1}, sort=[('day', DESCENDING)])
+        if not first:
+            return None, None
+        return date.fromisoformat(first['day']), date.fromisoformat(last['day'])
+
+    @_snapshot_cached
+    def totals(self, start=None, end=None) -> pd.DataFrame:
+        """Per-user sums over the inclusive day range, grouped server-side"""
+        columns = USAGE_COUNTER_COLUMNS
+        pipeline = [
+            {'$match': self._day_match(start, end)},
+            {'$group': {'_id': '$user', **{col: {'$sum': f'${col}'} for col in columns}, 'rows': {'$sum': 1}}},
+        ]
+        results = list(self.usage.aggregate(pipeline))
+        df = pd.DataFrame(results, columns=['_id'] + columns + ['rows'])
+        return df.rename(columns={'_id': 'user'})
+
+    @_snapshot_cached
+    def kpi_totals(self, start=None, end=None) -> Tuple[Dict, int, int]:
+        """Column totals, developer count and active developer count in one server-side pipeline"""
+        columns = get_registered_columns()
+        activity = {'$add': [f'${col}' for col in ACTIVITY_COLUMNS]}
+        pipeline = [
+            {'$match': self._day_match(start, end)},
+            # Per developer: totals of every registered column plus overall activity
+            {'$group': {'_id': '$user', **{col: {'$sum': f'${col}'} for col in columns},
+                        'activity': {'$sum': activity}}},
+            # Whole team: one document
+            {'$group': {'_id': None, **{col: {'$sum': f'${col}'} for col in columns},
+                        'developers': {'$sum': 1},
+                        'active_developers': {'$sum': {'$cond': [{'$gt': ['$activity', 0]}, 1, 0]}}}},
+        ]
+        results = list(self.usage.aggregate(pipeline))
+        if not results:
+            return {}, 0, 0
+        result = results[0]
+        return {col: result.get(col, 0) for col in columns}, result['developers'], result['active_developers']
+
+    @_snapshot_cached
+    def developer_totals(self, start=None, end=None, column: str = 'acceptedLinesAdded') -> pd.DataFrame:
+        """Per-developer totals of one column, sorted descending, for the lines accepted chart"""
+        pipeline = [
+            {'$match': self._day_match(start, end)},
+            {'$group': {'_id': '$user', 'total': {'$sum': f'${column}'}}},
+            {'$sort': {'total': -1}},
+        ]
+        results = list(self.usage.aggregate(pipeline))
+        if not results:
+            return pd.DataFrame()
+        return pd.DataFrame({
+            'Developer': [result['_id'] for result in results],
+            'Lines_Accepted': [result['total'] for result in results]
+        })
+
+    @_snapshot_cached
+    def daily_totals(self, start=None, end=None, columns: List[str] = None, by_user: bool = False) -> pd.DataFrame:
+        """Per-day sums of columns over [start, end], team-wide or per user, grouped server-side"""
+        columns = columns or USAGE_COUNTER_COLUMNS
+        group_id = {'period': '$day', 'user': '$user'} if by_user else {'period': '$day'}
+        pipeline = [
+            {'$match': self._day_match(start, end)},
+            {'$group': {'_id': group_id, **{col: {'$sum': f'${col}'} for col in columns}}},
+            {'$sort': {'_id.period': 1}},
+        ]
+        keys = ['period', 'user'] if by_user else ['period']
+        results = [{**result.pop('_id'), **result} for result in self.usage.aggregate(pipeline)]
+        df = pd.DataFrame(results, columns=keys + columns)
+        df['period'] = pd.to_datetime(df['period'])
+        return df
+
+    @_snapshot_cached
+    def developer_daily(self, user: str, start=None, end=None, columns: List[str] = None) -> pd.DataFrame:
+        """One developer's per-day sums of columns over [start, end], grouped server-side"""
+        columns = columns or USAGE_COUNTER_COLUMNS
+        pipeline = [
+            {'$match': {**self._day_match(start, end), 'user': user}},
+            {'$group': {'_id': '$day', **{col: {'$sum': f'${col}'} for col in columns}}},
+            {'$sort': {'_id': 1}},
+        ]
+        df = pd.DataFrame(list(self.usage.aggregate(pipeline)), columns=['_id'] + columns).rename(columns={'_id': 'period'})
+        df['period'] = pd.to_datetime(df['period'])
+        return df
+
+    def _day_match(self, start=None, end=None, team: str = None) -> Dict:
+        """Match documents in the inclusive day range, within the view's team if it has one"""
+        match = {}
+        team = team if team is not None else self.team
+        if team is not None:
+            match['team'] = team
+        day_range = {}
+        if start is not None:
+            day_range['$gte'] = _to_day(start).isoformat()
+        if end is not None:
+            day_range['$lte'] = _to_day(end).isoformat()
+        if day_range:
+            match['day'] = day_range
+        return match
+
+def _usage_frame(documents: List[Dict], columns: List[str]) -> pd.DataFrame:
+    df = pd.DataFrame(documents, columns=columns)
+    if not df.empty:
+        # BSON dates come back as naive UTC datetimes
+        df['date'] = to_epoch_ms(df['date'])
+    return df
+
+def _to_day(value) -> date:
+    return value.date() if hasattr(value, 'date') else value
@@ -0,0 +1,292 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Iterable, Iterator, List, Set
+import pandas as pd
+from ..config.settings import get_api_config, get_current_datetime, get_storage_config
+from ..utils.data_processing import USAGE_COUNTER_COLUMNS
+from ..utils.activity import ActivityIndex, decode_bits, encode_bits
+from ..utils.dates import DAY_MS, day_range_ms, epoch_day, utc_today
+from ..utils.schema import compact_usage_frame
+
+# Days that Cursor may still be updating and are therefore always re-fetched
+MUTABLE_DAYS = 2
+
+# Bumped when the usage table layout changes; stored in PRAGMA user_version
+SCHEMA_VERSION = 2
+
+class UsageStore:
+    """Persistent SQLite store of dashboard usage rows keyed by (team, email, day).
+
+    day is the UTC epoch day and date the UTC epoch milliseconds reported by the API.
+    Writes are serialized so several teams can be ingested into one store concurrently.
+    """
+    
+    def __init__(self, path: str = None):
+        self.path = path or get_storage_config()['path']
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._write_lock = threading.Lock()
+        self._create_schema()
+
+    @contextmanager
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _create_schema(self):
+        counters = ', '.join(f'{col} INTEGER NOT NULL DEFAULT 0' for col in USAGE_COUNTER_COLUMNS)
+        # Rows stored before teams existed belong to the single API_KEY team
+        legacy_team = get_api_config()['team_name']
+        with self._connect() as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            version = connection.execute('PRAGMA user_version').fetchone()[0]
+            tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            migrating = 'usage' in tables and version < SCHEMA_VERSION
+            if migrating:
+                # Older layouts are copied into freshly created tables below
+                connection.execute(f'ALTER TABLE usage RENAME TO usage_v{version}')
+                connection.execute('DROP INDEX IF EXISTS idx_usage_day')
+                if 'synced_days' in tables:
+                    connection.execute(f'ALTER TABLE synced_days RENAME TO synced_days_v{version}')
+            connection.execute(f"""
+                CREATE TABLE IF NOT EXISTS usage (
+                    team TEXT NOT NULL,
+                    email TEXT NOT NULL,
+                    day INTEGER NOT NULL,
+                    user TEXT NOT NULL,
+                    date INTEGER NOT NULL,
+                    {counters},
+                    PRIMARY KEY (team, email, day)
+                )
+            """)
+            connection.execute('CREATE INDEX IF NOT EXISTS idx_usage_day ON usage (day)')
+            # Tracks which days were fetched per team, so days without activity are not re-fetched
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS synced_days (
+                    team TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    synced_at TEXT NOT NULL,
+                    PRIMARY KEY (team, day)
+                )
+            """)
+            if migrating:
+                columns = ', '.join(USAGE_COUNTER_COLUMNS)
+                if version < 1:
+                    # Version 0 stored localized ISO strings; re-key them by UTC day
+                    epoch_ms = 'CAST(ROUND((julianday(date) - 2440587.5) * 86400000) AS INTEGER)'
+                    day, date_ms = f'{epoch_ms} / {DAY_MS}', epoch_ms
+                else:
+                    day, date_ms = 'day', 'date'
+                connection.execute(f"""
+                    INSERT OR REPLACE INTO usage (team, email, day, user, date, {columns})
+                    SELECT ?, email, {day}, user, {date_ms}, {columns} FROM usage_v{version}
+                """, (legacy_team,))
+                connection.execute(f'DROP TABLE usage_v{version}')
+                if 'synced_days' in tables:
+                    connection.execute(f"""
+                        INSERT OR REPLACE INTO synced_days (team, day, synced_at)
+                        SELECT ?, day, synced_at FROM synced_days_v{version}
+                    """, (legacy_team,))
+                    connection.execute(f'DROP TABLE synced_days_v{version}')
+                # Bitsets were keyed by local day or by developer alone; load_activity() rebuilds them
+                connection.execute('DROP TABLE IF EXISTS activity')
+            # One day-bitset per team and developer, kept current as rows are upserted
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS activity (
+                    team TEXT NOT NULL,
+                    user TEXT NOT NULL,
+                    bits BLOB NOT NULL,
+                    PRIMARY KEY (team, user)
+                )
+            """)
+            connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    def upsert_frame(self, df: pd.DataFrame) -> int:
+        """Insert or replace rows from a converted usage DataFrame, returning the number written"""
+        if df.empty:
+            return 0
+        df = _with_team(df)
+        dates = df['date'].to_numpy(dtype='int64')
+        columns = ['team', 'email', 'day', 'user', 'date'] + USAGE_COUNTER_COLUMNS
+        placeholders = ', '.join('?' for _ in columns)
+        values = pd.DataFrame({
+            'team': df['team'].astype(str),
+            'email': df['email'].astype(str),
+            'day': dates // DAY_MS,
+            'user': df['user'].astype(str),
+            'date': dates,
+            **{col: df[col].astype('int64') for col in USAGE_COUNTER_COLUMNS}
+        })
+        with self._write_lock:
+            with self._connect() as connection:
+                connection.executemany(
+                    f"INSERT OR REPLACE INTO usage ({', '.join(columns)}) VALUES ({placeholders})",
+                    values.itertuples(index=False, name=None)
+                )
+            self._update_activity(df)
+        return len(values)
+
+    def _update_activity(self, df: pd.DataFrame):
+        """Set or clear the activity bits of the upserted (team, user, day) rows"""
+        if df.empty:
+            return
+        df = _with_team(df)
+        with self._connect() as connection:
+            for team, rows in df.groupby(df['team'].astype(str), sort=False):
+                users = rows['user'].astype(str).unique().tolist()
+                placeholders = ', '.join('?' for _ in users)
+                stored = connection.execute(
+                    f'SELECT user, bits FROM activity WHERE team = ? AND user IN ({placeholders})', [team] + users
+                ).fetchall()
+                index = ActivityIndex({user: decode_bits(bits) for user, bits in stored})
+                index.update(rows)
+                connection.executemany(
+                    'INSERT OR REPLACE INTO activity (team, user, bits) VALUES (?, ?, ?)',
+                    [(team, user, encode_bits(index.bits[user])) for user in users]
+                )
+
+    def load_activity(self, team: str = None) -> ActivityIndex:
+        """Read one team's activity index, or all teams merged, rebuilding it if it has never been written"""
+        query, params = 'SELECT user, bits FROM activity', []
+        if team is not None:
+            query, params = query + ' WHERE team = ?', [team]
+        with self._connect() as connection:
+            rows = connection.execute(query, params).fetchall()
+            has_usage = connection.execute('SELECT 1 FROM usage LIMIT 1').fetchone() is not None
+            has_activity = connection.execute('SELECT 1 FROM activity LIMIT 1').fetchone() is not None
+        if has_activity or not has_usage:
+            bits = {}
+            for user, blob in rows:
+                # A developer in several teams is active on any day they were active in one of them
+                bits[user] = bits.get(user, 0) | decode_bits(blob)
+            return ActivityIndex(bits)
+        # Stores created before the activity table existed or migrated from an older layout
+        with self._write_lock:
+            self._update_activity(self.load())
+        return self.load_activity(team)
+
+    def mark_days_synced(self, days: Iterable[date], team: str = None):
+        """Record days as fetched from the API for a team"""
+        team = team or get_api_config()['team_name']
+        synced_at = get_current_datetime().isoformat()
+        with self._write_lock:
+            with self._connect() as connection:
+                connection.executemany(
+                    'INSERT OR REPLACE INTO synced_days (team, day, synced_at) VALUES (?, ?, ?)',
+                    [(team, day.isoformat(), synced_at) for day in days]
+                )
+
+    def get_synced_days(self, team: str = None) -> Set[date]:
+        """Get the set of days that have already been fetched for a team"""
+        team = team or get_api_config()['team_name']
+        with self._connect() as connection:
+            rows = connection.execute('SELECT day FROM synced_days WHERE team = ?', (team,)).fetchall()
+        return {date.fromisoformat(row[0]) for row in rows}
+
+    def teams(self) -> List[str]:
+        """Get the names of the teams with stored usage"""
+        with self._connect() as connection:
+            return [row[0] for row in connection.execute('SELECT DISTINCT team FROM usage ORDER BY team')]
+
+    def _select(self, columns: List[str], start_day: date = None, end_day: date = None, team: str = None):
+        """Build a query for columns limited to an inclusive day range and optionally one team"""
+        query = f"SELECT {', '.join(columns)} FROM usage"
+        conditions, params = [], []
+        if team is not None:
+            conditions.append('team = ?')
+            params.append(team)
+        if start_day:
+            conditions.append('day >= ?')
+            params.append(epoch_day(start_day))
+        if end_day:
+            conditions.append('day <= ?')
+            params.append(epoch_day(end_day))
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        return query, params
+
+    def load(self, start_day: date = None, end_day: date = None, team: str = None) -> pd.DataFrame:
+        """Read stored rows, optionally limited to an inclusive day range and one team"""
+        query, params = self._select(['team', 'user', 'email', 'date'] + USAGE_COUNTER_COLUMNS, start_day, end_day, team)
+        with self._connect() as connection:
+            return pd.read_sql_query(query + ' ORDER BY day, team, email', connection, params=params)
+
+    def iter_frames(self, start_day: date = None, end_day: date = None, columns: List[str] = None,
+                    chunk_rows: int = 50_000, team: str = None) -> Iterator[pd.DataFrame]:
+        """Yield stored rows ordered by team, developer and day, at most chunk_rows at a time"""
+        columns = ['team', 'user', 'email', 'date'] + [col for col in (columns or USAGE_COUNTER_COLUMNS) if col in USAGE_COUNTER_COLUMNS]
+        query, params = self._select(columns, start_day, end_day, team)
+        with self._connect() as connection:
+            # Follows the (team, email, day) primary key, so rows are read in order without sorting
+            cursor = connection.execute(query + ' ORDER BY team, email, day', params)
+            while True:
+                rows = cursor.fetchmany(chunk_rows)
+                if not rows:
+                    break
+                yield pd.DataFrame.from_records(rows, columns=columns)
+
+def _with_team(df: pd.DataFrame) -> pd.DataFrame:
+    """Tag rows converted without a team with the single API_KEY team"""
+    if 'team' in df.columns:
+        return df
+    return df.assign(team=get_api_config()['team_name'])
+
+def get_usage_store():
+    """Open the usage store for the configured backend"""
+    if get_storage_config()['backend'] == 'mongo':
+        # pymongo is only imported when the Mongo backend is selected
+        from .mongo_store import MongoUsageStore
+        return MongoUsageStore()
+    return UsageStore()
+
+def load_usage_frame(store: UsageStore = None) -> pd.DataFrame:
+    """Read the store into the compact usage frame the dashboard works on"""
+    df = (store or get_usage_store()).load()
+    if df.empty:
+        return df
+    return compact_usage_frame(df)
+
+def _contiguous_runs(days: List[date]) -> List[List[date]]:
+    """Group sorted days into runs of consecutive days"""
+    runs = []
+    for day in days:
+        if runs and day - runs[-1][-1] == timedelta(days=1):
+            runs[-1].append(day)
+        else:
+            runs.append([day])
+    return runs
+
+def get_days_to_sync(store: UsageStore, start_day: date, end_day: date, force: bool = False,
+                     team: str = None) -> List[date]:
+    """Work out which days in [start_day, end_day] are missing or still changing for a team"""
+    today = utc_today()
+    wanted = {start_day + timedelta(days=offset) for offset in range((end_day - start_day).days + 1)}
+    if force:
+        return sorted(wanted)
+    stale = {today - timedelta(days=offset) for offset in range(MUTABLE_DAYS)}
+    return sorted((wanted - store.get_synced_days(team)) | (stale & wanted))
+
+def sync_days(fetcher, store: UsageStore, days: List[date], force: bool = False) -> int:
+    """Fetch the given days for the fetcher's team into the store, returning rows written.
+
+    With force, windows are fetched from the API even when a backfill
+    checkpoint covers them. Checkpoints only bridge an interrupted run, so
+    they are deleted once their days are stored.
+    """
+    written = 0
+    for run in _contiguous_runs(sorted(days)):
+        # Days are UTC days, matching how the API dates its rows
+        start_ms, end_ms = day_range_ms(run[0], run[-1])
+        frame = fetcher.backfill_usage_frame(start_ms, end_ms - 1, force=force)
+        written += store.upsert_frame(frame)
+        store.mark_days_synced(run, fetcher.team)
+        fetcher.clear_checkpoints(start_ms, end_ms - 1)
+    return written
@@ -0,0 +1,107 @@
+from datetime import date, timedelta
+from typing import Dict, Iterable
+import numpy as np
+import pandas as pd
+from .dates import DAY_MS, epoch_day
+from .kpi_registry import ACTIVITY_COLUMNS
+
+def _bits_from_days(days: np.ndarray) -> int:
+    """Pack day numbers into a Python int with those bits set"""
+    if not len(days):
+        return 0
+    lowest = int(days.min())
+    flags = np.zeros(int(days.max()) - lowest + 1, dtype=bool)
+    flags[days - lowest] = True
+    return int.from_bytes(np.packbits(flags, bitorder='little').tobytes(), 'little') << lowest
+
+def encode_bits(bits: int) -> bytes:
+    """Serialize a bitset for storage"""
+    return bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+
+def decode_bits(blob: bytes) -> int:
+    """Deserialize a bitset written by encode_bits"""
+    return int.from_bytes(blob, 'little')
+
+class ActivityIndex:
+    """One day-bitset per developer: bit n is set when the developer was active on UTC epoch day n.
+
+    Counts, retention and streaks over any window are bitwise ANDs and
+    popcounts, so range changes never rescan usage rows.
+    """
+
+    def __init__(self, bits: Dict[str, int] = None):
+        self.bits = dict(bits or {})
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, day_column: str = 'date') -> 'ActivityIndex':
+        index = cls()
+        index.update(df, day_column)
+        return index
+
+    def update(self, df: pd.DataFrame, day_column: str = 'date'):
+        """Apply (user, day) rows: days present are set or cleared by their activity, other days are kept"""
+        if df.empty:
+            return
+        if pd.api.types.is_integer_dtype(df[day_column]):
+            # Epoch milliseconds, as stored in usage frames
+            day_numbers = df[day_column].to_numpy(dtype='int64') // DAY_MS
+        else:
+            day_numbers = pd.to_datetime(df[day_column]).to_numpy().astype('datetime64[D]').astype('int64')
+        activity_columns = [col for col in ACTIVITY_COLUMNS if col in df.columns]
+        active = (df[activity_columns].to_numpy(dtype='int64').sum(axis=1) > 0) if activity_columns else np.zeros(len(df), bool)
+
+        codes, users = pd.factorize(df['user'].astype(str))
+        order = np.argsort(codes, kind='stable')
+        boundaries = np.flatnonzero(np.diff(codes[order])) + 1
+        for rows in np.split(order, boundaries):
+            user = users[codes[rows[0]]]
+            touched = _bits_from_days(day_numbers[rows])
+            self.bits[user] = (self.bits.get(user, 0) & ~touched) | _bits_from_days(day_numbers[rows][active[rows]])
+
+    @staticmethod
+    def window_mask(start: date, end: date) -> int:
+        """Bitmask covering the inclusive day window [start, end]"""
+        first, last = epoch_day(start), epoch_day(end)
+        if last < first:
+            return 0
+        return ((1 << (last - first + 1)) - 1) << first
+
+    def active_count(self, start: date, end: date) -> int:
+        """Number of developers active on at least one day in [start, end]"""
+        mask = self.window_mask(start, end)
+        return sum(1 for bits in self.bits.values() if bits & mask)
+
+    def retained_count(self, previous: Iterable[date], current: Iterable[date]) -> int:
+        """Number of developers active in both the previous and the current window"""
+        previous_mask, current_mask = self.window_mask(*previous), self.window_mask(*current)
+        return sum(1 for bits in self.bits.values() if bits & previous_mask and bits & current_mask)
+
+    def active_days(self, user: str, start: date, end: date) -> int:
+        """Days in [start, end] on which user was active"""
+        return (self.bits.get(user, 0) & self.window_mask(start, end)).bit_count()
+
+    def longest_streak(self, user: str, start: date, end: date) -> int:
+        """Longest run of consecutive active days for user within [start, end]"""
+        bits = self.bits.get(user, 0) & self.window_mask(start, end)
+        streak = 0
+        # Each step drops the last day of every run, so the loop runs once per day of the longest run
+        while bits:
+            bits &= bits >> 1
+            streak += 1
+        return streak
+
+    def current_streak(self, user: str, as_of: date) -> int:
+        """Consecutive active days for user ending on as_of"""
+        last = epoch_day(as_of)
+        history = self.bits.get(user, 0) & ((1 << (last + 1)) - 1)
+        inactive = ~history & ((1 << (last + 1)) - 1)
+        return last - inactive.bit_length() + 1
+
+    def team_longest_streak(self, start: date, end: date) -> int:
+        """Longest streak of any developer within [start, end]"""
+        return max((self.longest_streak(user, start, end) for user in self.bits), default=0)
+
+def previous_window(start: date, end: date):
+    """The window of the same length immediately before [start, end]"""
+    length = (end - start).days + 1
+    return start - timedelta(days=length), start - timedelta(days=1)
@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Tuple
+from ..config.settings import get_current_datetime
+from .metrics import increment
+from .single_flight import SingleFlight
+
+class StaleWhileRevalidateCache:
+    """Keyed in-process cache with a TTL and stale-while-revalidate refreshes.
+
+    Fresh entries are returned as-is. Once an entry is older than the TTL it is
+    still returned immediately while a background thread reloads it, unless
+    background_refresh is off, in which case the caller reloads synchronously.
+    Loads are single-flight per key, so concurrent cold reads share one load.
+    """
+    
+    def __init__(self, ttl_seconds: float, background_refresh: bool = True):
+        self.ttl_seconds = ttl_seconds
+        self.background_refresh = background_refresh
+        self.hits = 0
+        self._entries: Dict[Hashable, Dict] = {}
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Tuple[Any, datetime]:
+        """Get (value, loaded_at) for key, loading or revalidating it as needed"""
+        with self._lock:
+            entry = self._entries.get(key)
+            is_stale = entry is not None and time.monotonic() - entry['loaded_monotonic'] > self.ttl_seconds
+            if is_stale and self.background_refresh and not entry['refreshing']:
+                entry['refreshing'] = True
+                threading.Thread(target=self._refresh, args=(key, loader), daemon=True).start()
+            if entry is not None and not (is_stale and not self.background_refresh):
+                self.hits += 1
+                increment('data_cache_hits_total', help_text='Dashboard data cache hits')
+                return entry['value'], entry['loaded_at']
+        
+        increment('data_cache_misses_total', help_text='Dashboard data cache misses, including coalesced ones')
+        return self._flight.do(key, lambda: self._store(key, loader()))
+
+    def is_refreshing(self, key: Hashable) -> bool:
+        """Check whether a background refresh is running for key"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return bool(entry and entry['refreshing'])
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache hits and issued vs coalesced loads"""
+        flight = self._flight.stats()
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'loads_issued': flight['issued'],
+                'loads_coalesced': flight['coalesced'],
+                'loads_in_flight': flight['in_flight'],
+                'entries': len(self._entries)
+            }
+
+    def _store(self, key: Hashable, value: Any) -> Tuple[Any, datetime]:
+        increment('data_cache_loads_total', help_text='Dashboard data loads actually run')
+        loaded_at = get_current_datetime()
+        with self._lock:
+            self._entries[key] = {
+                'value': value,
+                'loaded_at': loaded_at,
+                'loaded_monotonic': time.monotonic(),
+                'refreshing': False
+            }
+        return value, loaded_at
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any]):
+        try:
+            self._flight.do(key, lambda: self._store(key, loader()))
+        except Exception:
+            # Keep serving the stale value; the next stale read retries
+            with self._lock:
+                if key in self._entries:
+                    self._entries[key]['refreshing'] = False
+
+class LRUCache:
+    """Thread-safe keyed cache holding at most maxsize values, evicting the least recently used.
+
+    Values are computed outside the lock, so a key computed by two threads at
+    once is computed twice and the later value kept.
+    """
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._values: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Get the value for key, computing and storing it on a miss"""
+        with self._lock:
+            if key in self._values:
+                self._values.move_to_end(key)
+                return self._values[key]
+        value = compute()
+        with self._lock:
+            self._values[key] = value
+            self._values.move_to_end(key)
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+        return value
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._values)
@@ -1,49 +1,67 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from ..config.settings import get_timezone, get_current_datetime
+from ..config.settings import get_current_datetime
+from .kpi_registry import KPI_REGISTRY, compute_registered_kpis, reduce_registered_kpis
 
-def calculate_kpis(df):
-    """Calculate all KPI metrics from the dataframe"""
+# Per-day counters reported by the Cursor Admin API daily-usage-data endpoint
+USAGE_COUNTER_COLUMNS = [
+    'totalLinesAdded', 'totalLinesDeleted', 'acceptedLinesAdded', 'acceptedLinesDeleted',
+    'totalApplies', 'totalAccepts', 'totalRejects', 'totalTabsShown', 'totalTabsAccepted',
+    'composerRequests', 'chatRequests', 'agentRequests', 'cmdkUsages',
+    'subscriptionIncludedReqs', 'apiKeyReqs', 'usageBasedReqs', 'bugbotUsages'
+]
+
+# Days covered by each preset time range option
+DATE_RANGE_DAYS = {
+    '7D': 7,
+    '1M': 30,
+    '3M': 90,
+    '6M': 180,
+    '1Y': 365
+}
+
+def get_date_range(date_option, custom_range=None, tz=None):
+    """Get the inclusive (start_day, end_day) for a time range option, or None for all data.
+
+    Presets end on today in tz (default: the configured timezone). Custom
+    uses custom_range, which the caller keeps complete.
+    """
+    if date_option == 'Custom':
+        return tuple(custom_range) if custom_range else None
+    if date_option not in DATE_RANGE_DAYS:
+        return None
+    today = get_current_datetime(tz).date()
+    return today - timedelta(days=DATE_RANGE_DAYS[date_option] - 1), today
+
+def _resolve_usage_frame(data, date_range=None):
+    """Accept a usage DataFrame, or a UsageRollup/usage store answered for date_range"""
+    if isinstance(data, pd.DataFrame):
+        return data
+    return data.totals(*(date_range or (None, None)))
+
+def calculate_kpis(df, date_range=None):
+    """Calculate all registered KPI metrics from the dataframe, a UsageRollup or a usage store"""
+    if hasattr(df, 'kpi_totals'):
+        # Rollups and stores return pre-aggregated totals; active counts come from bitsets or the server
+        return reduce_registered_kpis(*df.kpi_totals(*(date_range or (None, None))))
+    df = _resolve_usage_frame(df, date_range)
     if df.empty:
-        return {
-            'total_developers': 0,
-            'active_developers': 0,
-            'avg_lines_per_dev': 0,
-            'acceptance_ratio': 0
-        }
-    
-    # Calculate total developers
-    total_developers = df['user'].nunique()
+        return {kpi['key']: 0 for kpi in KPI_REGISTRY}
     
     # Check if this is Cursor API data (has acceptedLinesAdded) or mock data (has usage_time_minutes)
     if 'acceptedLinesAdded' in df.columns:
-        # Cursor API data format
-        activity_columns = ['totalLinesAdded', 'totalLinesDeleted', 'acceptedLinesAdded', 'acceptedLinesDeleted',
-                           'totalApplies', 'totalAccepts', 'totalRejects', 'totalTabsShown', 'totalTabsAccepted',
-                           'composerRequests', 'chatRequests', 'agentRequests', 'cmdkUsages']
-        
-        available_activity_cols = [col for col in activity_columns if col in df.columns]
-        
-        if available_activity_cols:
-            activity_condition = df[available_activity_cols].sum(axis=1) > 0
-            active_developers = df[activity_condition]['user'].nunique()
-        else:
-            active_developers = df[df['acceptedLinesAdded'] > 0]['user'].nunique()
-        
-        total_accepted_lines = df['acceptedLinesAdded'].sum()
-        avg_lines_per_dev = total_accepted_lines / active_developers if active_developers > 0 else 0
-        total_suggested_lines = df['totalLinesAdded'].sum()
-        acceptance_ratio = (total_accepted_lines / total_suggested_lines * 100) if total_suggested_lines > 0 else 0
-        
-    else:
-        # Mock data format - use usage metrics instead
-        active_developers = df[df['usage_time_minutes'] > 0]['user'].nunique()
-        
-        # For mock data, simulate lines metrics based on usage
-        total_usage_minutes = df['usage_time_minutes'].sum()
-        avg_lines_per_dev = int(total_usage_minutes / active_developers * 10) if active_developers > 0 else 0  # Simulate lines based on usage
-        acceptance_ratio = 75.0  # Simulate acceptance ratio
+        # Cursor API data format - every registered KPI in one grouped pass
+        return compute_registered_kpis(df)
+    
+    # Mock data format - use usage metrics instead
+    total_developers = df['user'].nunique()
+    active_developers = df[df['usage_time_minutes'] > 0]['user'].nunique()
+    
+    # For mock data, simulate lines metrics based on usage
+    total_usage_minutes = df['usage_time_minutes'].sum()
+    avg_lines_per_dev = int(total_usage_minutes / active_developers * 10) if active_developers > 0 else 0  # Simulate lines based on usage
+    acceptance_ratio = 75.0  # Simulate acceptance ratio
     
     return {
         'total_developers': total_developers,
@@ -52,54 +70,24 @@ def calculate_kpis(df):
         'acceptance_ratio': acceptance_ratio
     }
 
-def filter_data_by_date(df, date_option):
-    """Filter dataframe by date range using configured timezone"""
-    if 'date' not in df.columns or not date_option:
+def sort_by_date(df):
+    """Return the dataframe ordered by date, sorting a copy only when needed"""
+    if 'date' not in df.columns or df['date'].is_monotonic_increasing:
         return df
-    
-    # Use configured timezone from settings
-    tz = get_timezone()
-    now = get_current_datetime()
-    
-    date_ranges = {
-        '7D': 7,
-        '1M': 30,
-        '3M': 90,
-        '6M': 180,
-        '1Y': 365
-    }
-    
-    if date_option in date_ranges:
-        start_date = now - timedelta(days=date_ranges[date_option])
-        end_date = now
-    else:
-        # Custom date range - return original df for now
-        return df
-    
-    # Convert date column to datetime and localize to configured timezone
-    df['date'] = pd.to_datetime(df['date'])
-    
-    # If dates don't have timezone info, assume they're in configured timezone
-    if df['date'].dt.tz is None:
-        df['date'] = df['date'].dt.tz_localize(tz)
-    
-    filtered_df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-    
-    # If no data found for the selected range, return the original data
-    # This ensures we always show something rather than empty dashboard
-    if filtered_df.empty and not df.empty:
-        return df
-    
-    return filtered_df
+    return df.sort_values('date', kind='stable', ignore_index=True)
 
-def prepare_chart_data(df):
-    """Prepare data for the lines accepted chart"""
+def prepare_chart_data(df, date_range=None):
+    """Prepare data for the lines accepted chart from the dataframe, a UsageRollup or a usage store"""
+    if hasattr(df, 'developer_totals'):
+        # The store groups and sorts server-side
+        return df.developer_totals(*(date_range or (None, None)))
+    df = _resolve_usage_frame(df, date_range)
     if df.empty:
         return pd.DataFrame()
     
     if 'acceptedLinesAdded' in df.columns:
         # Cursor API data format
-        user_accepted_lines = df.groupby('user')['acceptedLinesAdded'].sum().sort_values(ascending=False)
+        user_accepted_lines = df.groupby('user', observed=True)['acceptedLinesAdded'].sum().sort_values(ascending=False)
         
         return pd.DataFrame({
             'Developer': user_accepted_lines.index,
@@ -107,9 +95,36 @@ def prepare_chart_data(df):
         })
     else:
         # Mock data format - simulate lines based on usage
-        user_usage = df.groupby('user')['usage_time_minutes'].sum().sort_values(ascending=False)
+        user_usage = df.groupby('user', observed=True)['usage_time_minutes'].sum().sort_values(ascending=False)
         
         return pd.DataFrame({
             'Developer': user_usage.index,
             'Lines_Accepted': (user_usage.values * 10).astype(int)  # Simulate lines based on usage
-        }) 
\ No newline at end of file
+        }) 
+
+def top_n_chart_data(chart_data, top_n):
+    """Keep the top_n developers and fold everyone else into a single bar"""
+    if len(chart_data) <= top_n:
+        return chart_data
+    rest = chart_data.iloc[top_n:]
+    other = pd.DataFrame({
+        'Developer': [f"Everyone else ({len(rest)} developers)"],
+        'Lines_Accepted': [rest['Lines_Accepted'].sum()]
+    })
+    return pd.concat([chart_data.iloc[:top_n], other], ignore_index=True)
+
+def search_chart_data(chart_data, search=None):
+    """Number developers by team-wide rank and keep those whose name contains search"""
+    ranked = chart_data.assign(Rank=np.arange(1, len(chart_data) + 1))
+    if search:
+        ranked = ranked[ranked['Developer'].astype(str).str.contains(search, case=False, regex=False)]
+    return ranked
+
+def get_page_count(row_count, page_size):
+    """Number of pages needed for row_count rows, at least one"""
+    return max(-(-row_count // page_size), 1)
+
+def page_chart_data(chart_data, page, page_size):
+    """Return the rows on a 1-based page, clamped to the available pages"""
+    page = min(max(page, 1), get_page_count(len(chart_data), page_size))
+    return chart_data.iloc[(page - 1) * page_size:page * page_size]
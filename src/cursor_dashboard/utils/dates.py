@@ -0,0 +1,39 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Tuple
+import numpy as np
+import pandas as pd
+
+# Usage rows are dated by UTC day in epoch milliseconds, as the Cursor Admin API reports them
+DAY_MS = 86_400_000
+EPOCH = date(1970, 1, 1)
+
+def epoch_day(day) -> int:
+    """Days since the Unix epoch of a calendar date, datetime or Timestamp"""
+    return (day.date() if hasattr(day, 'date') else day).toordinal() - EPOCH.toordinal()
+
+def epoch_day_to_date(number: int) -> date:
+    """Calendar date of a day number since the Unix epoch"""
+    return EPOCH + timedelta(days=int(number))
+
+def utc_today() -> date:
+    """Today's UTC calendar day, the day the API is currently filling in"""
+    return datetime.now(timezone.utc).date()
+
+def day_range_ms(start_day, end_day) -> Tuple[int, int]:
+    """Epoch-millisecond bounds [start, end) covering the inclusive UTC day range"""
+    return epoch_day(start_day) * DAY_MS, (epoch_day(end_day) + 1) * DAY_MS
+
+def to_epoch_ms(values) -> np.ndarray:
+    """Epoch milliseconds of integer, datetime-like or ISO string values; naive datetimes are taken as UTC"""
+    values = pd.Series(values)
+    if pd.api.types.is_integer_dtype(values):
+        return values.to_numpy(dtype='int64')
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype('int64').to_numpy()
+    dates = pd.to_datetime(values, utc=True)
+    return dates.dt.tz_localize(None).to_numpy().astype('datetime64[ms]').astype('int64')
+
+def epoch_ms_to_days(values) -> pd.Series:
+    """UTC day (naive midnight Timestamps) of each epoch-millisecond value"""
+    days = np.asarray(values, dtype='int64') // DAY_MS
+    return pd.Series(days.astype('datetime64[D]').astype('datetime64[ns]'))
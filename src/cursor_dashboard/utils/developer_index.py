@@ -0,0 +1,43 @@
+from typing import Dict, Tuple
+import numpy as np
+import pandas as pd
+
+class DeveloperIndex:
+    """Row order of day-level rows sorted by developer, then day, with each developer's offsets into it.
+
+    Built once per data load; a developer's history is a slice of the order
+    and a day range within it is a binary search, so opening a developer
+    never scans other developers' rows. Only the order and the sorted days
+    are stored, not a second copy of the rows.
+    """
+
+    def __init__(self, day_df: pd.DataFrame, day_column: str = 'period'):
+        self.frame = day_df
+        self.offsets: Dict[str, Tuple[int, int]] = {}
+        if day_df.empty:
+            self.order = np.empty(0, dtype='int64')
+            self.days = np.empty(0, dtype='datetime64[ns]')
+            return
+
+        users = day_df['user']
+        if isinstance(users.dtype, pd.CategoricalDtype):
+            codes, names = users.cat.codes.to_numpy(), users.cat.categories.astype(str)
+        else:
+            codes, names = pd.factorize(users.astype(str))
+        days = day_df[day_column].to_numpy()
+        self.order = np.lexsort((days, codes))
+        self.days = days[self.order]
+        sorted_codes = codes[self.order]
+        boundaries = np.flatnonzero(np.diff(sorted_codes)) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [len(sorted_codes)]))
+        self.offsets = {names[sorted_codes[start]]: (int(start), int(end)) for start, end in zip(starts, ends)}
+
+    def rows(self, user: str, start=None, end=None) -> pd.DataFrame:
+        """A developer's day-level rows in day order, optionally limited to the inclusive day range [start, end]"""
+        first, last = self.offsets.get(str(user), (0, 0))
+        # Within a developer's slice the days are sorted
+        days = self.days[first:last]
+        lower = days.searchsorted(pd.Timestamp(start).to_datetime64()) if start is not None else 0
+        upper = days.searchsorted(pd.Timestamp(end).to_datetime64(), side='right') if end is not None else len(days)
+        return self.frame.iloc[self.order[first + lower:first + upper]]
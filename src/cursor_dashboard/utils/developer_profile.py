@@ -0,0 +1,78 @@
+from typing import Dict, Optional
+import pandas as pd
+from .activity import ActivityIndex
+from .kpi_registry import ACTIVITY_COLUMNS, REQUEST_MIX_COLUMNS
+
+# Daily timeline series and the counters summed into each
+TIMELINE_SERIES = {
+    'Accepted Lines': ['acceptedLinesAdded'],
+    'Tabs Accepted': ['totalTabsAccepted'],
+    'Requests': list(REQUEST_MIX_COLUMNS.values()),
+}
+
+# Features making up a developer's feature mix
+FEATURE_MIX_COLUMNS = {
+    'Tab': 'totalTabsAccepted',
+    'Composer': 'composerRequests',
+    'Chat': 'chatRequests',
+    'Agent': 'agentRequests',
+    'Cmd+K': 'cmdkUsages',
+}
+
+# Acceptance funnel steps: (offered column, accepted column)
+FUNNEL_STEPS = {
+    'Lines': ('totalLinesAdded', 'acceptedLinesAdded'),
+    'Applies': ('totalApplies', 'totalAccepts'),
+    'Tabs': ('totalTabsShown', 'totalTabsAccepted'),
+}
+
+# Every counter the profile reads
+PROFILE_COLUMNS = list(dict.fromkeys(
+    [col for columns in TIMELINE_SERIES.values() for col in columns] + list(FEATURE_MIX_COLUMNS.values()) +
+    [col for step in FUNNEL_STEPS.values() for col in step] + ACTIVITY_COLUMNS
+))
+
+def _developer_activity(source, user: str, start_day, end_day) -> Dict:
+    activity = getattr(source, 'activity', None)
+    if activity is None:
+        # Stores without an activity index: index this developer's own history
+        history = source.developer_daily(user, columns=ACTIVITY_COLUMNS).assign(user=user)
+        activity = ActivityIndex.from_frame(history, day_column='period')
+    return {
+        'active_days': activity.active_days(user, start_day, end_day),
+        'longest_streak': activity.longest_streak(user, start_day, end_day),
+        'current_streak': activity.current_streak(user, end_day),
+    }
+
+def prepare_developer_profile(source, user: str, date_range=None) -> Optional[Dict]:
+    """Daily timeline, feature mix, acceptance funnel and activity of one developer, from a UsageRollup or usage store"""
+    start_day, end_day = date_range or source.date_bounds()
+    if start_day is None:
+        return None
+    daily = source.developer_daily(user, start_day, end_day, PROFILE_COLUMNS)
+    totals = daily[PROFILE_COLUMNS].sum()
+
+    # Days without a row count as zero activity
+    days = pd.date_range(start_day, end_day, freq='D')
+    sums = daily.set_index('period').reindex(days, fill_value=0)
+    timeline = pd.concat([
+        pd.DataFrame({'Period': days, 'Metric': name, 'Count': sums[columns].sum(axis=1).to_numpy()})
+        for name, columns in TIMELINE_SERIES.items()
+    ], ignore_index=True)
+    feature_mix = pd.DataFrame({
+        'Feature': list(FEATURE_MIX_COLUMNS),
+        'Count': [int(totals[col]) for col in FEATURE_MIX_COLUMNS.values()]
+    })
+    funnel = pd.DataFrame([
+        {'Step': step, 'Offered': int(totals[offered]), 'Accepted': int(totals[accepted]),
+         'Rate': totals[accepted] / totals[offered] * 100 if totals[offered] > 0 else 0.0}
+        for step, (offered, accepted) in FUNNEL_STEPS.items()
+    ])
+    return {
+        'timeline': timeline,
+        'feature_mix': feature_mix,
+        'funnel': funnel,
+        'totals': totals,
+        'days': len(days),
+        **_developer_activity(source, user, start_day, end_day)
+    }
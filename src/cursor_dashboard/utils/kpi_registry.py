@@ -0,0 +1,174 @@
+from typing import Callable, Dict, List
+import pandas as pd
+
+# Columns that count as developer activity for the "Active Developers" KPI
+ACTIVITY_COLUMNS = ['totalLinesAdded', 'totalLinesDeleted', 'acceptedLinesAdded', 'acceptedLinesDeleted',
+                    'totalApplies', 'totalAccepts', 'totalRejects', 'totalTabsShown', 'totalTabsAccepted',
+                    'composerRequests', 'chatRequests', 'agentRequests', 'cmdkUsages']
+
+# Request types making up the request mix, keyed by share KPI
+REQUEST_MIX_COLUMNS = {
+    'composer_share': 'composerRequests',
+    'chat_share': 'chatRequests',
+    'agent_share': 'agentRequests',
+    'cmdk_share': 'cmdkUsages'
+}
+
+# Billing sources making up the billing split, keyed by share KPI
+BILLING_COLUMNS = {
+    'included_share': 'subscriptionIncludedReqs',
+    'api_key_share': 'apiKeyReqs',
+    'usage_based_share': 'usageBasedReqs'
+}
+
+# Registered KPIs in display order
+KPI_REGISTRY: List[Dict] = []
+
+def register_kpi(key: str, title: str, columns: List[str], reduce: Callable, value_format: str = '{:,.0f}',
+                 description='', gradient_colors: str = '#667eea 0%, #764ba2 100%', icon: str = '📊',
+                 show_card: bool = True):
+    """Register a KPI.
+
+    reduce receives the reduction context: a Series of column totals for
+    every registered column plus 'developers' and 'active_developers'.
+    description may be a string or a callable taking the computed KPI dict.
+    KPIs with show_card=False are computed but only used by other cards.
+    """
+    KPI_REGISTRY[:] = [kpi for kpi in KPI_REGISTRY if kpi['key'] != key]
+    KPI_REGISTRY.append({
+        'key': key,
+        'title': title,
+        'columns': list(columns),
+        'reduce': reduce,
+        'value_format': value_format,
+        'description': description,
+        'gradient_colors': gradient_colors,
+        'icon': icon,
+        'show_card': show_card
+    })
+
+def get_registered_columns() -> List[str]:
+    """Get every column any registered KPI (or the activity check) reads"""
+    columns = list(ACTIVITY_COLUMNS)
+    for kpi in KPI_REGISTRY:
+        columns.extend(col for col in kpi['columns'] if col not in columns)
+    return columns
+
+def _ratio(numerator, denominator, scale=100):
+    return numerator / denominator * scale if denominator > 0 else 0
+
+def _share(column: str, columns: List[str]) -> Callable:
+    return lambda ctx: _ratio(ctx[column], sum(ctx[col] for col in columns))
+
+register_kpi(
+    'total_developers', 'Total Developers', [],
+    lambda ctx: int(ctx['developers']),
+    description='Unique developers', gradient_colors='#667eea 0%, #764ba2 100%', icon='👥'
+)
+# Retention and streaks come from the activity index and are 0 for sources without one
+register_kpi(
+    'retention_rate', 'Retention', [],
+    lambda ctx: _ratio(ctx.get('retained_developers', 0), ctx.get('previous_active_developers', 0)),
+    value_format='{:.0f}%', show_card=False
+)
+register_kpi('longest_streak', 'Longest Streak', [], lambda ctx: int(ctx.get('longest_streak', 0)), show_card=False)
+register_kpi(
+    'active_developers', 'Active Developers', [],
+    lambda ctx: int(ctx['active_developers']),
+    description=lambda kpis: (f"Best streak {kpis['longest_streak']}d" +
+                              (f" · {kpis['retention_rate']:.0f}% retained" if kpis['retention_rate'] else '')
+                              if kpis['longest_streak'] else 'With any activity'),
+    gradient_colors='#f093fb 0%, #f5576c 100%', icon='🚀'
+)
+register_kpi(
+    'avg_lines_per_dev', 'Avg Lines/Dev', ['acceptedLinesAdded'],
+    lambda ctx: _ratio(ctx['acceptedLinesAdded'], ctx['active_developers'], scale=1),
+    value_format='{:.0f}', description='Per active developer', gradient_colors='#4facfe 0%, #00f2fe 100%', icon='📊'
+)
+register_kpi(
+    'acceptance_ratio', 'Acceptance Ratio', ['acceptedLinesAdded', 'totalLinesAdded'],
+    lambda ctx: _ratio(ctx['acceptedLinesAdded'], ctx['totalLinesAdded']),
+    value_format='{:.1f}%', description='Accepted/Suggested', gradient_colors='#43e97b 0%, #38f9d7 100%', icon='✅'
+)
+register_kpi(
+    'tab_acceptance_rate', 'Tab Acceptance', ['totalTabsAccepted', 'totalTabsShown'],
+    lambda ctx: _ratio(ctx['totalTabsAccepted'], ctx['totalTabsShown']),
+    value_format='{:.1f}%', description='Tabs accepted/shown', gradient_colors='#fa709a 0%, #fee140 100%', icon='⇥'
+)
+
+# Apply → accept/reject funnel
+register_kpi('total_applies', 'Applies', ['totalApplies'], lambda ctx: ctx['totalApplies'], show_card=False)
+register_kpi(
+    'apply_reject_rate', 'Reject Rate', ['totalRejects', 'totalApplies'],
+    lambda ctx: _ratio(ctx['totalRejects'], ctx['totalApplies']), value_format='{:.1f}%', show_card=False
+)
+register_kpi(
+    'apply_accept_rate', 'Apply Funnel', ['totalAccepts', 'totalApplies'],
+    lambda ctx: _ratio(ctx['totalAccepts'], ctx['totalApplies']),
+    value_format='{:.1f}%',
+    description=lambda kpis: f"{kpis['total_applies']:,.0f} applies · {kpis['apply_reject_rate']:.0f}% rejected",
+    gradient_colors='#30cfd0 0%, #330867 100%', icon='🔁'
+)
+
+# Request mix across composer/chat/agent/cmdk
+for share_key, column in REQUEST_MIX_COLUMNS.items():
+    register_kpi(share_key, column, list(REQUEST_MIX_COLUMNS.values()),
+                 _share(column, list(REQUEST_MIX_COLUMNS.values())), value_format='{:.0f}%', show_card=False)
+register_kpi(
+    'total_requests', 'AI Requests', list(REQUEST_MIX_COLUMNS.values()),
+    lambda ctx: sum(ctx[col] for col in REQUEST_MIX_COLUMNS.values()),
+    description=lambda kpis: (f"Composer {kpis['composer_share']:.0f}% · Chat {kpis['chat_share']:.0f}% · "
+                              f"Agent {kpis['agent_share']:.0f}% · Cmd+K {kpis['cmdk_share']:.0f}%"),
+    gradient_colors='#a18cd1 0%, #fbc2eb 100%', icon='💬'
+)
+
+# Billing split across subscription/apiKey/usageBased
+for share_key, column in BILLING_COLUMNS.items():
+    register_kpi(share_key, column, list(BILLING_COLUMNS.values()),
+                 _share(column, list(BILLING_COLUMNS.values())), value_format='{:.0f}%', show_card=False)
+register_kpi(
+    'included_request_share', 'Included Requests', list(BILLING_COLUMNS.values()),
+    lambda ctx: _ratio(ctx['subscriptionIncludedReqs'], sum(ctx[col] for col in BILLING_COLUMNS.values())),
+    value_format='{:.1f}%',
+    description=lambda kpis: f"API key {kpis['api_key_share']:.0f}% · Usage-based {kpis['usage_based_share']:.0f}%",
+    gradient_colors='#f6d365 0%, #fda085 100%', icon='💳'
+)
+
+def compute_registered_kpis(df: pd.DataFrame) -> Dict:
+    """Compute every registered KPI from one groupby over the frame"""
+    columns = [col for col in get_registered_columns() if col in df.columns]
+    # A single grouped reduction yields per-developer totals; everything else is derived from it
+    per_user = df.groupby('user', observed=True, sort=False)[columns].sum()
+    
+    activity_columns = [col for col in ACTIVITY_COLUMNS if col in per_user.columns]
+    active_developers = int((per_user[activity_columns].sum(axis=1) > 0).sum()) if activity_columns else 0
+    return reduce_registered_kpis(per_user.sum(), len(per_user), active_developers)
+
+def reduce_registered_kpis(column_totals, developers: int, active_developers: int, context: Dict = None) -> Dict:
+    """Apply every registered reduction to pre-aggregated column totals.
+
+    context adds values only some sources can provide, such as the activity
+    index's retention and streak figures.
+    """
+    ctx = pd.Series(column_totals, dtype='float64').reindex(get_registered_columns(), fill_value=0.0)
+    ctx['developers'] = developers
+    ctx['active_developers'] = active_developers
+    for key, value in (context or {}).items():
+        ctx[key] = value
+    return {kpi['key']: kpi['reduce'](ctx) for kpi in KPI_REGISTRY}
+
+def get_kpi_cards(kpis: Dict) -> List[Dict]:
+    """Build the card configurations for every registered KPI present in kpis"""
+    cards = []
+    for kpi in KPI_REGISTRY:
+        if not kpi['show_card'] or kpi['key'] not in kpis:
+            continue
+        description = kpi['description']
+        cards.append({
+            'title': kpi['title'],
+            'value': kpi['value_format'].format(kpis[kpi['key']]),
+            'description': description(kpis) if callable(description) else description,
+            'gradient_colors': kpi['gradient_colors'],
+            'icon': kpi['icon']
+        })
+    return cards
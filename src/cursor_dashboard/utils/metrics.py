@@ -0,0 +1,136 @@
+import contextvars
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from ..config.settings import get_metrics_config
+
+logger = logging.getLogger(__name__)
+
+# Prefix of every exported metric name
+METRIC_PREFIX = 'cursor_dashboard'
+
+# Spans recorded by the current script run (or ingest run), when one is being traced
+_current_trace: contextvars.ContextVar[Optional[List[Dict]]] = contextvars.ContextVar('trace', default=None)
+
+class MetricsRegistry:
+    """Process-wide counters and per-stage timing summaries, exportable in Prometheus text format"""
+
+    def __init__(self):
+        self._counters: Dict[Tuple[str, Tuple], float] = {}
+        self._help: Dict[str, str] = {}
+        self._timings: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1, help_text: str = '', **labels):
+        """Add value to the counter name{labels}"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+            if help_text:
+                self._help.setdefault(name, help_text)
+
+    def observe(self, stage: str, seconds: float):
+        """Record one timed run of stage"""
+        with self._lock:
+            timing = self._timings.setdefault(stage, {'count': 0, 'sum': 0.0, 'max': 0.0})
+            timing['count'] += 1
+            timing['sum'] += seconds
+            timing['max'] = max(timing['max'], seconds)
+
+    def counters(self) -> Dict[Tuple[str, Tuple], float]:
+        with self._lock:
+            return dict(self._counters)
+
+    def timings(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {stage: dict(timing) for stage, timing in self._timings.items()}
+
+    def render_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines = []
+        timings = self.timings()
+        if timings:
+            name = f'{METRIC_PREFIX}_stage_seconds'
+            lines += [f'# HELP {name} Wall time spent in each pipeline stage', f'# TYPE {name} summary']
+            for stage, timing in sorted(timings.items()):
+                lines.append(f'{name}_count{{stage="{stage}"}} {timing["count"]}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {timing["sum"]:.6f}')
+            lines += [f'# TYPE {name}_max gauge']
+            lines += [f'{name}_max{{stage="{stage}"}} {timing["max"]:.6f}' for stage, timing in sorted(timings.items())]
+
+        by_name: Dict[str, List] = {}
+        for (counter, labels), value in sorted(self.counters().items()):
+            by_name.setdefault(counter, []).append((labels, value))
+        for counter, samples in by_name.items():
+            name = f'{METRIC_PREFIX}_{counter}'
+            if counter in self._help:
+                lines.append(f'# HELP {name} {self._help[counter]}')
+            lines.append(f'# TYPE {name} counter')
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{value}"' for key, value in labels)
+                lines.append(f'{name}{{{label_text}}} {_format_value(value)}' if label_text else f'{name} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str):
+        """Write the metrics to path for a textfile collector, replacing it atomically"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # A unique temporary file per write, so concurrent sessions never rename each other's file
+        fd, tmp_path = tempfile.mkstemp(dir=directory or '.', prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+        try:
+            # mkstemp creates the file owner-only; collectors usually read it as another user
+            os.fchmod(fd, 0o644)
+            with os.fdopen(fd, 'w') as f:
+                f.write(self.render_prometheus())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+def _format_value(value: float) -> str:
+    # Whole numbers are written without an exponent so large byte counts stay exact
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+METRICS = MetricsRegistry()
+
+@contextmanager
+def span(stage: str):
+    """Time a pipeline stage; set 'rows' on the yielded dict to count rows it processed"""
+    attributes = {}
+    started = time.perf_counter()
+    try:
+        yield attributes
+    finally:
+        seconds = time.perf_counter() - started
+        METRICS.observe(stage, seconds)
+        if 'rows' in attributes:
+            METRICS.increment('rows_processed_total', attributes['rows'], 'Rows processed per stage', stage=stage)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.append({'stage': stage, 'seconds': seconds, **attributes})
+
+def increment(name: str, value: float = 1, help_text: str = '', **labels):
+    """Add value to a process-wide counter"""
+    METRICS.increment(name, value, help_text, **labels)
+
+def start_trace() -> List[Dict]:
+    """Collect the spans recorded on this thread from now on and return the list they go to"""
+    trace = []
+    _current_trace.set(trace)
+    return trace
+
+def export_metrics():
+    """Write the Prometheus metrics file, if one is configured, logging rather than raising on failure"""
+    path = get_metrics_config()['prometheus_file']
+    if not path:
+        return
+    try:
+        METRICS.write_prometheus(path)
+    except OSError as e:
+        # Metrics are best effort and must never break a dashboard or ingest run
+        logger.warning("Could not write metrics to %s: %s", path, e)
@@ -0,0 +1,25 @@
+import threading
+import time
+
+class RateLimiter:
+    """Space calls at least 1/rate seconds apart across all threads sharing the limiter.
+
+    A rate of 0 disables the limit.
+    """
+
+    def __init__(self, rate: float = 0):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until the caller may make its next call"""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            # Reserve the slot before sleeping so waiting threads queue up behind it
+            self._next_at = start_at + self.interval
+        if start_at > now:
+            time.sleep(start_at - now)
@@ -0,0 +1,170 @@
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from .activity import ActivityIndex, previous_window
+from .data_cache import LRUCache
+from .dates import epoch_ms_to_days
+from .developer_index import DeveloperIndex
+from .kpi_registry import get_registered_columns
+
+# Rollup levels, coarsest first
+ROLLUP_LEVELS = ('month', 'week', 'day')
+
+# Range totals each rollup keeps, least recently used dropped first
+TOTALS_CACHE_SIZE = 64
+
+def _to_day(value) -> date:
+    """Normalize a date, datetime or Timestamp to a calendar date"""
+    if isinstance(value, pd.Timestamp):
+        return value.date()
+    if hasattr(value, 'date'):
+        return value.date()
+    return value
+
+def _next_month(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+def period_start(days: pd.Series, level: str) -> pd.Series:
+    """Map normalized days to the start of their day, ISO-week or month bucket"""
+    if level == 'week':
+        return days - pd.to_timedelta(days.dt.weekday, unit='D')
+    if level == 'month':
+        return days.dt.to_period('M').dt.start_time
+    return days
+
+def plan_buckets(start_day: date, end_day: date) -> Dict[str, List[date]]:
+    """Cover [start_day, end_day] with whole months, then ISO weeks, then single days"""
+    buckets = {level: [] for level in ROLLUP_LEVELS}
+    day = start_day
+    while day <= end_day:
+        month_start = day if day.day == 1 else _next_month(day)
+        month_fits = _next_month(month_start) - timedelta(days=1) <= end_day
+        week_end = day + timedelta(days=6)
+        if day == month_start and month_fits:
+            buckets['month'].append(day)
+            day = _next_month(day)
+        elif day.weekday() == 0 and week_end <= end_day and not (week_end >= month_start and month_fits):
+            # Weeks never run into a month that can be taken whole
+            buckets['week'].append(day)
+            day += timedelta(days=7)
+        else:
+            buckets['day'].append(day)
+            day += timedelta(days=1)
+    return buckets
+
+class UsageRollup:
+    """Per-user sums of every counter column at day, ISO-week and month granularity.
+
+    Built once per data load; range queries combine whole months, weeks and
+    edge days so their cost depends on users x buckets, not on daily rows.
+    A per-developer index over the day level serves drill-downs by slice.
+    """
+    
+    def __init__(self, df: pd.DataFrame, activity: ActivityIndex = None):
+        self.levels = {}
+        self.activity = activity or ActivityIndex()
+        self.developers = DeveloperIndex(pd.DataFrame(columns=['period', 'user']))
+        self.value_columns = []
+        self.min_day = None
+        self.max_day = None
+        self._totals_cache = LRUCache(TOTALS_CACHE_SIZE)
+        if df.empty or 'date' not in df.columns or 'user' not in df.columns:
+            return
+        
+        # Bucket on UTC days, the granularity the API reports
+        days = epoch_ms_to_days(df['date'])
+        self.min_day = days.min().date()
+        self.max_day = days.max().date()
+        
+        self.value_columns = [
+            col for col in df.columns
+            if col not in ('team', 'user', 'email', 'date') and pd.api.types.is_numeric_dtype(df[col])
+        ]
+        # Widen to int64 so month-level sums never overflow the compact counter dtypes
+        values = df[self.value_columns].astype('int64')
+        values['rows'] = 1
+        values['user'] = df['user'].array
+        
+        for level in ROLLUP_LEVELS:
+            grouped = values.groupby([period_start(days, level).to_numpy(), 'user'], observed=True, sort=True).sum()
+            grouped.index.names = ['period', 'user']
+            self.levels[level] = grouped.reset_index()
+        if activity is None:
+            self.activity = ActivityIndex.from_frame(self.levels['day'], day_column='period')
+        self.developers = DeveloperIndex(self.levels['day'])
+
+    @property
+    def empty(self) -> bool:
+        return not self.levels
+
+    def date_bounds(self) -> Tuple[Optional[date], Optional[date]]:
+        """Get the first and last day covered by the rollup"""
+        return self.min_day, self.max_day
+
+    def totals(self, start=None, end=None) -> pd.DataFrame:
+        """Per-user sums over the inclusive day range [start, end]"""
+        if self.empty:
+            return pd.DataFrame()
+        start_day = max(_to_day(start), self.min_day) if start is not None else self.min_day
+        end_day = min(_to_day(end), self.max_day) if end is not None else self.max_day
+        return self._totals_cache.get((start_day, end_day), lambda: self._compute_totals(start_day, end_day))
+
+    def kpi_totals(self, start=None, end=None) -> Tuple[pd.Series, int, int, Dict]:
+        """Column totals, developer counts, retention and streaks for reduce_registered_kpis"""
+        totals = self.totals(start, end)
+        if self.empty or totals.empty:
+            return pd.Series(dtype='float64'), 0, 0, {}
+        start_day = max(_to_day(start), self.min_day) if start is not None else self.min_day
+        end_day = min(_to_day(end), self.max_day) if end is not None else self.max_day
+        columns = [col for col in get_registered_columns() if col in totals.columns]
+        previous = previous_window(start_day, end_day)
+        context = {
+            'retained_developers': self.activity.retained_count(previous, (start_day, end_day)),
+            'previous_active_developers': self.activity.active_count(*previous),
+            'longest_streak': self.activity.team_longest_streak(start_day, end_day),
+        }
+        return totals[columns].sum(), len(totals), self.activity.active_count(start_day, end_day), context
+
+    def _compute_totals(self, start_day: date, end_day: date) -> pd.DataFrame:
+        columns = ['user'] + self.value_columns + ['rows']
+        if start_day > end_day:
+            return pd.DataFrame(columns=columns)
+        parts = []
+        for level, bucket_days in plan_buckets(start_day, end_day).items():
+            if bucket_days:
+                level_df = self.levels[level]
+                # Levels are sorted by period, so each bucket is a contiguous slice found by binary search
+                periods = level_df['period'].to_numpy()
+                buckets = pd.to_datetime(bucket_days).to_numpy()
+                lower, upper = periods.searchsorted(buckets), periods.searchsorted(buckets, side='right')
+                rows = np.concatenate([np.arange(first, last) for first, last in zip(lower, upper)])
+                parts.append(level_df.iloc[rows])
+        combined = pd.concat(parts, ignore_index=True)
+        if combined.empty:
+            return pd.DataFrame(columns=columns)
+        return combined.groupby('user', observed=True, sort=False)[self.value_columns + ['rows']].sum().reset_index()
+
+    def daily_totals(self, start=None, end=None, columns: List[str] = None, by_user: bool = False) -> pd.DataFrame:
+        """Per-day sums of columns over [start, end], team-wide or per user"""
+        columns = columns or self.value_columns
+        keys = ['period', 'user'] if by_user else ['period']
+        if self.empty:
+            return pd.DataFrame(columns=keys + columns)
+        day_df = self.levels['day']
+        lower = pd.Timestamp(_to_day(start)) if start is not None else day_df['period'].iloc[0]
+        upper = pd.Timestamp(_to_day(end)) if end is not None else day_df['period'].iloc[-1]
+        # Day-level rows are sorted by period, so the range is a contiguous slice
+        periods = day_df['period'].to_numpy()
+        in_range = day_df.iloc[periods.searchsorted(lower.to_datetime64()):periods.searchsorted(upper.to_datetime64(), side='right')]
+        in_range = in_range.reindex(columns=keys + columns, fill_value=0)
+        if by_user:
+            return in_range.reset_index(drop=True)
+        return in_range.groupby('period', sort=True)[columns].sum().reset_index()
+
+    def developer_daily(self, user: str, start=None, end=None, columns: List[str] = None) -> pd.DataFrame:
+        """One developer's per-day sums of columns over [start, end], looked up in the developer index"""
+        columns = columns or self.value_columns
+        rows = self.developers.rows(user, _to_day(start) if start is not None else None,
+                                    _to_day(end) if end is not None else None)
+        return rows.reindex(columns=['period'] + columns, fill_value=0).reset_index(drop=True)
@@ -0,0 +1,71 @@
+import logging
+from typing import Dict
+import numpy as np
+import pandas as pd
+from .data_processing import USAGE_COUNTER_COLUMNS
+from .dates import to_epoch_ms
+
+logger = logging.getLogger(__name__)
+
+# Candidate counter dtypes, narrowest first
+UNSIGNED_DTYPES = [pd.UInt8Dtype(), pd.UInt16Dtype(), pd.UInt32Dtype(), pd.UInt64Dtype()]
+SIGNED_DTYPES = [pd.Int8Dtype(), pd.Int16Dtype(), pd.Int32Dtype(), pd.Int64Dtype()]
+
+def narrowest_integer_dtype(values: pd.Series):
+    """Pick the smallest nullable integer dtype that holds every value in the series"""
+    if values.empty or values.isna().all():
+        return pd.UInt8Dtype()
+    low, high = values.min(), values.max()
+    candidates = UNSIGNED_DTYPES if low >= 0 else SIGNED_DTYPES
+    for dtype in candidates:
+        info = np.iinfo(dtype.numpy_dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return candidates[-1]
+
+def frame_memory_bytes(df: pd.DataFrame) -> int:
+    """Get the deep memory footprint of a DataFrame in bytes"""
+    return int(df.memory_usage(deep=True).sum())
+
+def enforce_usage_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Return a compact copy of a usage DataFrame.
+
+    team/user/email become categoricals, counters become the narrowest nullable
+    integer dtype for their value range and date int64 UTC epoch milliseconds.
+    """
+    if df.empty:
+        return df
+    compact = pd.DataFrame(index=df.index)
+    for col in df.columns:
+        values = df[col]
+        if col in ('team', 'user', 'email'):
+            compact[col] = values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype('category')
+        elif col == 'date':
+            compact[col] = to_epoch_ms(values)
+        elif col in USAGE_COUNTER_COLUMNS:
+            compact[col] = values.astype(narrowest_integer_dtype(values))
+        else:
+            compact[col] = values
+    return compact
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> Dict:
+    """Compare the memory footprint of a frame before and after compaction"""
+    before_bytes = frame_memory_bytes(before)
+    after_bytes = frame_memory_bytes(after)
+    return {
+        'rows': len(after),
+        'before_bytes': before_bytes,
+        'after_bytes': after_bytes,
+        'saved_pct': (1 - after_bytes / before_bytes) * 100 if before_bytes > 0 else 0
+    }
+
+def compact_usage_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Enforce the compact schema and log the memory saved"""
+    compact = enforce_usage_schema(df)
+    report = memory_report(df, compact)
+    compact.attrs['memory_report'] = report
+    logger.info(
+        "Usage frame compacted: %s rows, %.1f MB -> %.1f MB (%.0f%% saved)",
+        report['rows'], report['before_bytes'] / 1e6, report['after_bytes'] / 1e6, report['saved_pct']
+    )
+    return compact
@@ -0,0 +1,48 @@
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+class SingleFlight:
+    """Run at most one call per key at a time; callers arriving meanwhile wait and share its result.
+
+    issued counts calls that actually ran and coalesced counts callers that
+    were served by another caller's in-flight call.
+    """
+
+    def __init__(self):
+        self.issued = 0
+        self.coalesced = 0
+        self._calls: Dict[Hashable, Dict] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Return fn(), or the result of the call for key already in flight"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {'done': threading.Event(), 'result': None, 'error': None}
+                self.issued += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call['done'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
+
+        try:
+            call['result'] = fn()
+        except BaseException as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call['done'].set()
+        return call['result']
+
+    def stats(self) -> Dict[str, int]:
+        """Get issued, coalesced and currently in-flight call counts"""
+        with self._lock:
+            return {'issued': self.issued, 'coalesced': self.coalesced, 'in_flight': len(self._calls)}
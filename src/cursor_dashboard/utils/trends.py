@@ -0,0 +1,75 @@
+from datetime import date
+from typing import Dict, List
+import pandas as pd
+from .downsampling import lttb_indices
+from .kpi_registry import REQUEST_MIX_COLUMNS
+from .rollups import period_start
+
+# Trend metrics: counters summed per period and how to turn the sums into the plotted value
+TREND_METRICS: Dict[str, Dict] = {
+    'Accepted Lines': {
+        'columns': ['acceptedLinesAdded'],
+        'value': lambda sums: sums['acceptedLinesAdded'],
+    },
+    'Tab Acceptance %': {
+        'columns': ['totalTabsAccepted', 'totalTabsShown'],
+        'value': lambda sums: (sums['totalTabsAccepted'] / sums['totalTabsShown'].where(sums['totalTabsShown'] > 0) * 100).fillna(0),
+    },
+    'Requests': {
+        'columns': list(REQUEST_MIX_COLUMNS.values()),
+        'value': lambda sums: sums[list(REQUEST_MIX_COLUMNS.values())].sum(axis=1),
+    },
+}
+
+# Longest range, in days, plotted at each resolution
+RESOLUTION_MAX_DAYS = (('day', 92), ('week', 366))
+
+def choose_resolution(start_day: date, end_day: date) -> str:
+    """Pick the day, week or month resolution for a range"""
+    span = (end_day - start_day).days + 1
+    for resolution, max_days in RESOLUTION_MAX_DAYS:
+        if span <= max_days:
+            return resolution
+    return 'month'
+
+def _range_bounds(source, date_range):
+    if date_range:
+        return date_range
+    return source.date_bounds()
+
+def prepare_team_trend(source, metric: str, date_range=None) -> pd.DataFrame:
+    """Team-wide metric per day, week or month over the range, from a UsageRollup or usage store"""
+    start_day, end_day = _range_bounds(source, date_range)
+    if start_day is None:
+        return pd.DataFrame()
+    spec = TREND_METRICS[metric]
+    daily = source.daily_totals(start_day, end_day, spec['columns'])
+    if daily.empty:
+        return pd.DataFrame()
+    resolution = choose_resolution(start_day, end_day)
+    # Sum counters per bucket before deriving the value, so rates are weighted correctly
+    sums = daily.groupby(period_start(daily['period'], resolution).to_numpy())[spec['columns']].sum()
+    return pd.DataFrame({'Period': sums.index, metric: spec['value'](sums).to_numpy()}).assign(Resolution=resolution)
+
+def prepare_developer_trends(source, metric: str, developers: List[str], date_range=None,
+                             max_points: int = 120) -> pd.DataFrame:
+    """Daily metric per developer, each series downsampled to max_points with LTTB"""
+    start_day, end_day = _range_bounds(source, date_range)
+    if start_day is None or not developers:
+        return pd.DataFrame()
+    spec = TREND_METRICS[metric]
+    daily = source.daily_totals(start_day, end_day, spec['columns'], by_user=True)
+    daily = daily[daily['user'].isin(developers)]
+    if daily.empty:
+        return pd.DataFrame()
+
+    days = pd.date_range(start_day, end_day, freq='D')
+    x = days.to_numpy().astype('int64') / 86_400_000_000_000
+    series = []
+    for developer, rows in daily.groupby('user', observed=True, sort=False):
+        # Days without a row count as zero activity
+        sums = rows.set_index('period')[spec['columns']].reindex(days, fill_value=0)
+        values = spec['value'](sums).to_numpy(dtype='float64')
+        kept = lttb_indices(x, values, max_points)
+        series.append(pd.DataFrame({'Period': days[kept], 'Developer': str(developer), metric: values[kept]}))
+    return pd.concat(series, ignore_index=True)
@@ -1,19 +1,10 @@
-import streamlit as st
+import functools
 import os
+import streamlit as st
 from ..config.settings import DASHBOARD_CONFIG
 
-def load_css():
-    """Load CSS styles from external file"""
-    css_file_path = os.path.join(os.path.dirname(__file__), '..', 'static', 'css', 'styles.css')
-    
-    try:
-        with open(css_file_path, 'r') as f:
-            css_content = f.read()
-        st.markdown(f"<style>{css_content}</style>", unsafe_allow_html=True)
-    except FileNotFoundError:
-        # Fallback to inline CSS if file doesn't exist
-        st.markdown("""
-        <style>
+# Used when static/css/styles.css is missing
+FALLBACK_CSS = """
         .stApp {
             background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
             min-height: 100vh;
@@ -29,8 +20,22 @@ def load_css():
             padding-left: 1rem !important;
             padding-right: 1rem !important;
         }
-        </style>
-        """, unsafe_allow_html=True)
+"""
+
+@functools.lru_cache(maxsize=None)
+def _read_css():
+    """Read the stylesheet once per process"""
+    css_file_path = os.path.join(os.path.dirname(__file__), '..', 'static', 'css', 'styles.css')
+    try:
+        with open(css_file_path, 'r') as f:
+            return f.read()
+    except FileNotFoundError:
+        # Fallback to inline CSS if file doesn't exist
+        return FALLBACK_CSS
+
+def load_css():
+    """Inject the CSS styles; must run on every script run since each run rebuilds the page"""
+    st.markdown(f"<style>{_read_css()}</style>", unsafe_allow_html=True)
 
 def create_header(title=None):
     """Create the dashboard header"""
@@ -0,0 +1,79 @@
+"""
+Parity of the Mongo usage store's server-side aggregations with the pandas rollup.
+
+Needs a MongoDB server at MONGO_TEST_URI (default mongodb://localhost:27017);
+the tests are skipped when none is reachable.
+"""
+import os
+import uuid
+from datetime import timedelta
+
+import pytest
+
+pymongo = pytest.importorskip('pymongo')
+
+from cursor_dashboard.api.integration import CursorAPIFetcher
+from cursor_dashboard.api.synthetic import generate_usage_payload
+from cursor_dashboard.utils.data_processing import USAGE_COUNTER_COLUMNS
+from cursor_dashboard.utils.kpi_registry import get_registered_columns
+from cursor_dashboard.utils.rollups import UsageRollup
+from cursor_dashboard.utils.schema import compact_usage_frame
+
+@pytest.fixture(scope='module')
+def client():
+    client = pymongo.MongoClient(os.getenv('MONGO_TEST_URI', 'mongodb://localhost:27017'),
+                                 serverSelectionTimeoutMS=500)
+    try:
+        client.admin.command('ping')
+    except pymongo.errors.PyMongoError:
+        pytest.skip('No MongoDB server available')
+    yield client
+    client.close()
+
+@pytest.fixture(scope='module')
+def usage():
+    """Synthetic usage where two emails share one developer name, as the same person on two domains"""
+    payload = generate_usage_payload(developers=30, days=60, seed=7)
+    first_email = payload['data'][0]['email']
+    payload['data'] += [
+        {**record, 'email': first_email.replace('@example.com', '@example.org')}
+        for record in payload['data'] if record['email'] == first_email
+    ]
+    df = CursorAPIFetcher(base_url='http://localhost', api_key='test')._convert_cursor_data_to_dashboard_frame(payload)
+    return compact_usage_frame(df)
+
+@pytest.fixture(scope='module')
+def store(client, usage):
+    from cursor_dashboard.storage.mongo_store import MongoUsageStore
+    database = f'cursor_dashboard_test_{uuid.uuid4().hex[:8]}'
+    store = MongoUsageStore(client=client, database=database)
+    store.upsert_frame(usage)
+    yield store
+    client.drop_database(database)
+
+@pytest.fixture(scope='module')
+def rollup(usage):
+    return UsageRollup(usage)
+
+def _ranges(rollup):
+    return [
+        (rollup.min_day, rollup.max_day),
+        (rollup.min_day + timedelta(days=9), rollup.max_day - timedelta(days=13)),
+    ]
+
+def test_kpi_totals_match_rollup(store, rollup):
+    for start, end in _ranges(rollup):
+        totals, developers, active = store.kpi_totals(start, end)
+        expected_totals, expected_developers, expected_active, _ = rollup.kpi_totals(start, end)
+        assert developers == expected_developers
+        assert active == expected_active
+        for column in get_registered_columns():
+            assert totals[column] == expected_totals[column], column
+
+def test_totals_match_rollup(store, rollup):
+    for start, end in _ranges(rollup):
+        totals = store.totals(start, end).set_index('user').sort_index()
+        expected = rollup.totals(start, end).set_index('user').sort_index()
+        expected.index = expected.index.astype(str)
+        assert totals.index.tolist() == expected.index.tolist()
+        assert (totals[USAGE_COUNTER_COLUMNS].to_numpy() == expected[USAGE_COUNTER_COLUMNS].to_numpy()).all()